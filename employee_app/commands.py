@@ -0,0 +1,154 @@
+import sys
+
+import click
+from frappe.commands import pass_context
+from frappe.exceptions import SiteNotSpecifiedError
+
+
+@click.command("reconcile-employee-counters")
+@pass_context
+def reconcile_employee_counters(context):
+    """Rebuild number_of_employees / number_of_departments from the source tables."""
+    import frappe
+
+    from employee_app.employee_app.counters import reconcile_counters
+
+    if not context.sites:
+        raise SiteNotSpecifiedError
+
+    for site in context.sites:
+        frappe.init(site=site)
+        frappe.connect()
+        try:
+            reconcile_counters()
+            frappe.db.commit()
+            click.echo(f"{site}: counters reconciled")
+        finally:
+            frappe.destroy()
+
+
+@click.command("rebuild-employee-statistics")
+@pass_context
+def rebuild_employee_statistics(context):
+    """Recompute the Employee Statistics and Employee Hire Statistics tables."""
+    import frappe
+
+    from employee_app.employee_app.statistics import rebuild_statistics
+
+    if not context.sites:
+        raise SiteNotSpecifiedError
+
+    for site in context.sites:
+        frappe.init(site=site)
+        frappe.connect()
+        try:
+            result = rebuild_statistics()
+            frappe.db.commit()
+            click.echo(
+                f"{site}: {result['statistics']} statistics rows, "
+                f"{result['hire_statistics']} hire statistics rows rebuilt"
+            )
+        finally:
+            frappe.destroy()
+
+
+@click.command("check-employee-indexes")
+@click.option(
+    "--min-rows",
+    default=1000,
+    type=int,
+    help="Ignore full scans of tables estimated smaller than this.",
+)
+@pass_context
+def check_employee_indexes(context, min_rows):
+    """EXPLAIN the API queries and fail if any falls back to a full table scan."""
+    import frappe
+
+    from employee_app.employee_app.indexes import check_query_plans
+
+    if not context.sites:
+        raise SiteNotSpecifiedError
+
+    failed = False
+    for site in context.sites:
+        frappe.init(site=site)
+        frappe.connect()
+        try:
+            for failure in check_query_plans(min_rows=min_rows):
+                failed = True
+                click.secho(
+                    f"{site}: {failure.label} scans {failure.table} (~{failure.rows} rows)",
+                    fg="red",
+                )
+        finally:
+            frappe.destroy()
+
+    if failed:
+        sys.exit(1)
+    click.echo("All API queries use an index.")
+
+
+@click.command("employee-app-benchmark")
+@click.option("--sizes", default="1000,10000,100000", help="Comma-separated employee counts to benchmark at.")
+@click.option("--companies", default=5, type=int, help="Synthetic companies per tenant.")
+@click.option("--departments", default=10, type=int, help="Synthetic departments per company.")
+@click.option("--repeat", default=20, type=int, help="Calls per endpoint per size.")
+@click.option("--output", type=click.Path(dir_okay=False), help="Write the JSON report to this file.")
+@click.option("--compare", "baseline", type=click.Path(exists=True, dir_okay=False), help="Baseline report to check for regressions.")
+@click.option("--tolerance", default=1.2, type=float, help="Allowed slowdown factor before a metric counts as a regression.")
+@click.option("--keep-data", is_flag=True, default=False, help="Do not delete the synthetic tenant afterwards.")
+@click.option("--force", is_flag=True, default=False, help="Run even if the site does not have allow_tests enabled.")
+@pass_context
+def employee_app_benchmark(context, sizes, companies, departments, repeat, output, baseline, tolerance, keep_data, force):
+    """Time every API endpoint on generated tenants of increasing size."""
+    import json
+
+    import frappe
+
+    from employee_app.employee_app import benchmark
+
+    if not context.sites:
+        raise SiteNotSpecifiedError
+
+    site = context.sites[0]
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        if not (frappe.conf.allow_tests or force):
+            click.secho("Benchmarks write synthetic data. Enable allow_tests or pass --force.", fg="red")
+            sys.exit(1)
+
+        report = benchmark.run(
+            [int(size) for size in sizes.split(",") if size.strip()],
+            companies=companies,
+            departments_per_company=departments,
+            repeat=repeat,
+            keep_data=keep_data,
+        )
+    finally:
+        frappe.destroy()
+
+    rendered = json.dumps(report, indent=1, default=str)
+    if output:
+        with open(output, "w") as f:
+            f.write(rendered)
+    else:
+        click.echo(rendered)
+
+    if baseline:
+        regressions = benchmark.compare(benchmark.load_report(baseline), report, tolerance)
+        for regression in regressions:
+            click.secho(
+                "{employees} employees, {endpoint}: {metric} {before} -> {after}".format(**regression),
+                fg="red",
+            )
+        if regressions:
+            sys.exit(1)
+
+
+commands = [
+    reconcile_employee_counters,
+    rebuild_employee_statistics,
+    check_employee_indexes,
+    employee_app_benchmark,
+]
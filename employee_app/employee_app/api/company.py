@@ -1,6 +1,16 @@
 import frappe
+
+from employee_app.employee_app.batch import fetch_by_names, fetch_related, parse_names
+from employee_app.employee_app.cache import get_cached
+from employee_app.employee_app.jobs import submit_job
+from employee_app.employee_app.pagination import paginate
+from employee_app.employee_app.profiler import profiled
+from employee_app.employee_app.projection import get_related_limit, parse_include, select_fields
+from employee_app.employee_app.responses import api_response, not_modified
+from employee_app.employee_app.utils import doc_to_dict, unit_of_work
+
 from .department import DEPARTMENT_READ_FIELDS
-from .employee import EMPLOYEE_READ_FIELDS
+from .employee import get_employee_read_fields
 
 COMPANY_READ_FIELDS = [
     "name",
@@ -10,6 +20,8 @@ COMPANY_READ_FIELDS = [
 ]
 
 COMPANY_WRITE_FIELDS = ["company_name"]
+# related collections that can be embedded in company reads
+RELATIONS = ["departments", "employees"]
 # utility functions
 # function to check if send restricted fields
 def is_restricted_field(field, **kwargs):
@@ -17,17 +29,23 @@ def is_restricted_field(field, **kwargs):
     restricted_fields = ["number_of_employees", "number_of_departments"]
     return field in restricted_fields
 
-# API Response Helper Fn
-def api_response(status_code, message, data=None):
-    frappe.local.response["http_status_code"] = status_code
-    frappe.local.response["message"] = message
-    frappe.local.response["data"] = data
-    return frappe.local.response
+def get_relation(relation):
+    """(doctype, read fields) of an embeddable company relation."""
+    if relation == "departments":
+        return "Department", DEPARTMENT_READ_FIELDS
+    return "Employee", get_employee_read_fields()
 
 # READ - Get single company
 @frappe.whitelist(allow_guest=False)
+@profiled
 def get_company(*args, **kwargs):
-    """Get details for a single Company."""
+    """Get details for a single Company.
+
+    `fields` limits the company's columns; `include` (default: departments,
+    employees) picks the embedded collections. They are returned in full
+    unless capped by `departments_limit` / `employees_limit` (or
+    `related_limit`); `<relation>_has_more` tells whether the cap left rows out.
+    """
     name = kwargs.get("name")
     if not name:
         api_response(
@@ -37,9 +55,14 @@ def get_company(*args, **kwargs):
         )
         return
 
+    include = parse_include(kwargs.get("include"), RELATIONS, default=RELATIONS)
+    related = [(get_relation(relation)[0], {"company": name}) for relation in include]
+    if not_modified(("Company", {"name": name}), *related, params=kwargs):
+        return
+
     # Fetch company details
     company = frappe.db.get_value(
-        "Company", name, COMPANY_READ_FIELDS, as_dict=True
+        "Company", name, select_fields(kwargs.get("fields"), COMPANY_READ_FIELDS), as_dict=True
     )
     if not company:
         api_response(
@@ -49,33 +72,85 @@ def get_company(*args, **kwargs):
         )
         return
     # get related departments and employees
-    departments = get_company_related_departments(company=name)
-    employees = get_company_related_employee(company=name)
-    
+    data = {"company": company}
+    for relation in include:
+        doctype, fields = get_relation(relation)
+        rows, has_more = fetch_related(
+            doctype, fields, "company", [name], get_related_limit(kwargs, relation, default=None)
+        )
+        data[relation] = rows[name]
+        data[f"{relation}_has_more"] = has_more[name]
+
     api_response(
         status_code=200,
         message=f"Company '{name}' retrieved successfully.",
+        data=data
+    )
+
+# READ - Get many companies by name
+@frappe.whitelist(allow_guest=False)
+@profiled
+def get_companies(*args, **kwargs):
+    """Get several Companies in one call, optionally with `include=departments,employees`.
+
+    Related records are capped per company by `departments_limit` /
+    `employees_limit` (or `related_limit`, default 10); each company's
+    `<relation>_has_more` tells whether the cap left rows out.
+    """
+    names = parse_names(kwargs.get("names"))
+    include = parse_include(kwargs.get("include"), RELATIONS)
+    related = [(get_relation(relation)[0], {"company": ["in", names]}) for relation in include]
+    if not_modified(("Company", {"name": ["in", names]}), *related, params=kwargs):
+        return
+
+    companies = fetch_by_names(
+        "Company", select_fields(kwargs.get("fields"), COMPANY_READ_FIELDS), names
+    )
+    related = {}
+    for relation in include:
+        doctype, fields = get_relation(relation)
+        related[relation] = fetch_related(
+            doctype, fields, "company", list(companies), get_related_limit(kwargs, relation)
+        )
+    for name, company in companies.items():
+        for relation, (rows, has_more) in related.items():
+            company[relation] = rows[name]
+            company[f"{relation}_has_more"] = has_more[name]
+
+    api_response(
+        status_code=200,
+        message=f"{len(companies)} companies retrieved successfully.",
         data={
-            "company": company,
-            "departments": departments,
-            "employees": employees
+            "companies": companies,
+            "missing": [name for name in names if name not in companies],
         }
     )
 
+
 # READ - List companies
 @frappe.whitelist(allow_guest=False)
+@profiled
 def list_companies(*args, **kwargs):
-    """List all companies"""
-    companies = frappe.get_all("Company", fields=COMPANY_READ_FIELDS)
-    return companies
+    """List companies one page at a time, continuing from `cursor`."""
+    if not_modified(("Company", None), params=kwargs):
+        return
+    return paginate(
+        "Company",
+        fields=select_fields(kwargs.get("fields"), COMPANY_READ_FIELDS),
+        cursor=kwargs.get("cursor"),
+        page_size=kwargs.get("page_size"),
+    )
 
 # READ - Get departments related to a specific company
 @frappe.whitelist(allow_guest=False)
+@profiled
 def get_company_related_departments(*args, **kwargs):
     """Get all departments related to a specific company."""
     company = kwargs.get("company")
     if not company:
         frappe.throw("Company name is required.")
+    if not_modified(("Department", {"company": company}), params=kwargs):
+        return
 
     departments = frappe.get_all(
         "Department",
@@ -87,25 +162,29 @@ def get_company_related_departments(*args, **kwargs):
 
 # READ -Get Employyes related to company 
 @frappe.whitelist(allow_guest=False)
+@profiled
 def get_company_related_employee(*args, **kwargs):
     """Get all employees related to a specific company."""
     company = kwargs.get("company")
     if not company:
         frappe.throw("Company name is required.")
+    if not_modified(("Employee", {"company": company}), params=kwargs):
+        return
 
     employees = frappe.get_all(
         "Employee",
         filters={"company": company},
-        fields=EMPLOYEE_READ_FIELDS
+        fields=get_employee_read_fields()
     )
     
     return employees
 
 # READ - Get all companies count
 @frappe.whitelist(allow_guest=False)
+@profiled
 def get_all_companies_count():
     """Get the total number of companies."""   
-    company_count = frappe.db.count("Company")
+    company_count = get_cached("companies_count", lambda: frappe.db.count("Company"))
     api_response(
         status_code=200,
         message="Total number of companies retrieved successfully.",
@@ -114,6 +193,8 @@ def get_all_companies_count():
 
 # CREATE - Add a new company
 @frappe.whitelist(allow_guest=False)
+@profiled
+@unit_of_work
 def create_company(**kwargs):
     """Create a new Company."""
     company_name = kwargs.get("company_name")
@@ -127,13 +208,14 @@ def create_company(**kwargs):
     # Create and insert the new company document
     doc = frappe.get_doc({"doctype": "Company", "company_name": company_name})
     doc.insert()
-    frappe.db.commit()
 
-    return frappe.db.get_value("Company", doc.name, COMPANY_READ_FIELDS, as_dict=True)
+    return doc_to_dict(doc, COMPANY_READ_FIELDS)
 
 
 # UPDATE
 @frappe.whitelist(allow_guest=False)
+@profiled
+@unit_of_work
 def update_company(**kwargs):
     """Update the company_name"""
     
@@ -154,41 +236,54 @@ def update_company(**kwargs):
 
     company.company_name = company_name
     company.save()
-    frappe.db.commit()
 
-    return frappe.db.get_value(
-            "Company",
-            company.name,
-            COMPANY_READ_FIELDS,
-            as_dict=True
-        )
+    return doc_to_dict(company, COMPANY_READ_FIELDS)
   
 
 # DELETE - Remove a company
 @frappe.whitelist(allow_guest=False)
+@profiled
 def delete_company(**kwargs):
+    """Queue deletion of a Company with its departments and employees (cascading delete).
+
+    Returns a job id to follow with api.job.get_job_status.
+    """
     name = kwargs.get("name")
     if not name:
         frappe.response["message"] = "Company name is required."
         frappe.response["http_status_code"] = 400
         return
-    """Delete a Company."""
-    company = frappe.get_doc("Company", name)
-    if not company:
+
+    if not frappe.db.exists("Company", name):
         frappe.throw(f"Company '{name}' not found.")
-        
-    """" Check if the company has related departments or employees before deletion and delete related departments and employees if they exist. CASECADING DELETE """
-    related_departments = frappe.db.get_all("Department", {"company": name})
-    if related_departments:
-        for department in related_departments:
-            frappe.delete_doc("Department", department.name)
-    
-    related_employees = frappe.db.get_all("Employee", {"company": name})
-    if related_employees:
-        for employee in related_employees:
-            frappe.delete_doc("Employee", employee.name)
-
-    # Finally, delete the company document
-    frappe.delete_doc("Company", name)
-    frappe.db.commit()
-    return {"message": f"Company '{name}' deleted successfully."}
+
+    if not frappe.has_permission(doctype="Company", ptype="delete", doc=name):
+        frappe.throw("Not permitted", frappe.PermissionError)
+
+    job_id = submit_job(
+        "delete",
+        "employee_app.employee_app.cascade.delete_company_cascade",
+        description=f"Delete company {name}",
+        company=name,
+    )
+    frappe.response["http_status_code"] = 202
+    return {"message": f"Company '{name}' is being deleted.", "job_id": job_id}
+
+
+# UPDATE - Rebuild all employee / department counters
+@frappe.whitelist(allow_guest=False)
+@profiled
+def reconcile_counters(*args, **kwargs):
+    """Queue a rebuild of every company and department counter."""
+    frappe.only_for("System Manager")
+
+    job_id = submit_job(
+        "reconcile",
+        "employee_app.employee_app.counters.reconcile_counters",
+        description="Reconcile employee and department counters",
+    )
+    api_response(
+        status_code=202,
+        message="Counter reconciliation queued.",
+        data={"job_id": job_id}
+    )
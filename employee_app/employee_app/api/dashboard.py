@@ -1,41 +1,38 @@
 import frappe
+from frappe.utils import today
 
-# Local imports
-from .company import list_companies
-from .employee import get_recently_hired_employees, get_all_employees_count
-from .department import get_all_depratments_count  
-
-def api_response(status_code, message, data=None):
-    """
-    Standardized API response helper.
-    """
-    frappe.local.response["http_status_code"] = status_code
-    frappe.local.response["message"] = message
-    frappe.local.response["data"] = data
-    return frappe.local.response
+from employee_app.employee_app.cache import get_cache_stats as _get_cache_stats
+from employee_app.employee_app.cache import get_cached
+from employee_app.employee_app.dashboard import get_dashboard_data
+from employee_app.employee_app.profiler import profiled
+from employee_app.employee_app.responses import api_response, not_modified
 
 
 @frappe.whitelist(allow_guest=False)
+@profiled
 def get_dashboard_stats(*args, **kwargs):
     """
-    Fetch dashboard statistics including companies, recent hires,
-    employee count, and department count.
+    Fetch dashboard statistics including a page of companies, recent hires,
+    totals, employees per workflow state and hires per month.
+
+    Optional params: companies_limit, companies_cursor, hires_months.
     """
-    try:
-        companies = list_companies()
-        recent_employees = get_recently_hired_employees()
-        employees_count = get_all_employees_count()
-        department_count = get_all_depratments_count()
+    params = {
+        "companies_limit": kwargs.get("companies_limit"),
+        "companies_cursor": kwargs.get("companies_cursor"),
+        "hires_months": kwargs.get("hires_months"),
+    }
+    # recent hires and hires per month also move with the calendar
+    if not_modified(
+        ("Employee", None), ("Department", None), ("Company", None), params={**params, "today": today()}
+    ):
+        return
 
+    try:
         api_response(
             status_code=200,
             message="Dashboard data returned successfully",
-            data={
-                "companies": companies,
-                "recent_employees": recent_employees,
-                "employees_count": employees_count,
-                "department_count": department_count
-            }
+            data=get_cached("dashboard", lambda: get_dashboard_data(**params), params),
         )
     except Exception as e:
         frappe.log_error(f"Dashboard API Error: {str(e)}", "get_dashboard_stats")
@@ -44,3 +41,15 @@ def get_dashboard_stats(*args, **kwargs):
             message="Failed to retrieve dashboard data",
             data=None
         )
+
+
+@frappe.whitelist(allow_guest=False)
+@profiled
+def get_cache_stats(*args, **kwargs):
+    """Dashboard cache hit / miss counters, for System Managers."""
+    frappe.only_for("System Manager")
+    api_response(
+        status_code=200,
+        message="Cache statistics retrieved successfully.",
+        data=_get_cache_stats()
+    )
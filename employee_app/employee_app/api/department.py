@@ -1,5 +1,15 @@
 import frappe
-from .employee import EMPLOYEE_READ_FIELDS
+
+from employee_app.employee_app.batch import fetch_by_names, fetch_related, parse_names
+from employee_app.employee_app.cache import get_cached
+from employee_app.employee_app.jobs import submit_job
+from employee_app.employee_app.pagination import paginate
+from employee_app.employee_app.profiler import profiled
+from employee_app.employee_app.projection import get_related_limit, parse_include, select_fields
+from employee_app.employee_app.responses import api_response, not_modified
+from employee_app.employee_app.utils import doc_to_dict, unit_of_work
+
+from .employee import get_employee_read_fields
 
 DEPARTMENT_READ_FIELDS = [
     "name",
@@ -11,55 +21,120 @@ DEPARTMENT_READ_FIELDS = [
 DEPARTMENT_WRITE_FIELDS = ["department_name", "company"]
 RESTRICTED_FIELDS = ["number_of_employees"]
 
-# API Response Helper Fn
-def api_response(status_code, message, data=None):
-    frappe.local.response["http_status_code"] = status_code
-    frappe.local.response["message"] = message
-    frappe.local.response["data"] = data
-    return frappe.local.response
-
-
 # READ - Get single department
 @frappe.whitelist(allow_guest=False)
+@profiled
 def get_department(*args, **kwargs):
-    """Get details for a single Department."""
+    """Get details for a single Department.
+
+    `fields` limits the department's columns; `include` (default: employees)
+    picks the embedded collections. Employees are returned in full unless
+    capped by `employees_limit`; `employees_has_more` tells whether the cap
+    left rows out.
+    """
     name = kwargs.get("name")
     if not name:
-        frappe.logger.info(f"Department name is required. {kwargs}")
+        frappe.logger().info(f"Department name is required. {kwargs}")
         api_response(
             status_code=400,
             message="Department name is required!",
             data=None
         )
         return
+    include = parse_include(kwargs.get("include"), ["employees"], default=["employees"])
+    related = [("Employee", {"department": name})] if "employees" in include else []
+    if not_modified(("Department", {"name": name}), *related, params=kwargs):
+        return
+
     department = frappe.db.get_value(
-        "Department", name, DEPARTMENT_READ_FIELDS, as_dict=True
+        "Department", name, select_fields(kwargs.get("fields"), DEPARTMENT_READ_FIELDS), as_dict=True
     )
     if not department:
-        frappe.logger.info(f"Department not found. {name}")
+        frappe.logger().info(f"Department not found. {name}")
         api_response(
             status_code=404,
             message=f"Department '{name}' not found.",
             data=None
         )
         return
+    data = {"department": department}
     # get related employees
-    employees = get_department_related_employees(department=name, company=department.company)
+    if "employees" in include:
+        employees, has_more = fetch_related(
+            "Employee",
+            get_employee_read_fields(),
+            "department",
+            [name],
+            get_related_limit(kwargs, "employees", default=None),
+        )
+        data["employees"] = employees[name]
+        data["employees_has_more"] = has_more[name]
     api_response(
         status_code=200,
         message=f"Department '{name}' retrieved successfully.",
+        data=data
+    )
+
+
+# READ - Get many departments by name
+@frappe.whitelist(allow_guest=False)
+@profiled
+def get_departments(*args, **kwargs):
+    """Get several Departments in one call, optionally with `include=employees`.
+
+    Related employees are capped at `employees_limit` (default 10) per
+    department; each department's `employees_has_more` tells whether the
+    cap left rows out.
+    """
+    names = parse_names(kwargs.get("names"))
+    include = parse_include(kwargs.get("include"), ["employees"])
+    related = [("Employee", {"department": ["in", names]})] if "employees" in include else []
+    if not_modified(("Department", {"name": ["in", names]}), *related, params=kwargs):
+        return
+
+    departments = fetch_by_names(
+        "Department", select_fields(kwargs.get("fields"), DEPARTMENT_READ_FIELDS), names
+    )
+    if "employees" in include:
+        employees, has_more = fetch_related(
+            "Employee",
+            get_employee_read_fields(),
+            "department",
+            list(departments),
+            get_related_limit(kwargs, "employees"),
+        )
+        for name, department in departments.items():
+            department["employees"] = employees[name]
+            department["employees_has_more"] = has_more[name]
+
+    api_response(
+        status_code=200,
+        message=f"{len(departments)} departments retrieved successfully.",
         data={
-            "department": department,
-            "employees": employees
+            "departments": departments,
+            "missing": [name for name in names if name not in departments],
         }
     )
 
 
 # READ - List departments
 @frappe.whitelist(allow_guest=False)
+@profiled
 def list_departments(*args, **kwargs):
-    """List all departments the user can access."""
-    departments = frappe.get_all("Department", fields=DEPARTMENT_READ_FIELDS)
+    """List departments one page at a time, optionally for a single company."""
+    filters = []
+    if kwargs.get("company"):
+        filters.append(["Department", "company", "=", kwargs["company"]])
+    if not_modified(("Department", filters), params=kwargs):
+        return
+
+    departments = paginate(
+        "Department",
+        fields=select_fields(kwargs.get("fields"), DEPARTMENT_READ_FIELDS),
+        filters=filters,
+        cursor=kwargs.get("cursor"),
+        page_size=kwargs.get("page_size"),
+    )
     api_response(
         status_code=200,
         message="Departments retrieved successfully.",
@@ -69,6 +144,7 @@ def list_departments(*args, **kwargs):
 
 # READ - Get employees related to a specific department
 @frappe.whitelist(allow_guest=False)
+@profiled
 def get_department_related_employees(*args, **kwargs):
     """Get all employees related to a specific department."""
     department = kwargs.get("department")
@@ -76,17 +152,21 @@ def get_department_related_employees(*args, **kwargs):
 
     if not department or not company:
         return
+    if not_modified(("Employee", {"department": department, "company": company}), params=kwargs):
+        return
 
     employees = frappe.get_all(
         "Employee",
         filters={"department": department, "company": company},
-        fields=EMPLOYEE_READ_FIELDS,
+        fields=get_employee_read_fields(),
     )
     return employees
 
 
 # CREATE - Add a new department
 @frappe.whitelist(allow_guest=False)
+@profiled
+@unit_of_work
 def create_department(*args, **kwargs):
     """Create a new Department linked to a company."""
     department_name = kwargs.get("department_name")
@@ -111,20 +191,17 @@ def create_department(*args, **kwargs):
     doc.company = company
     doc.insert(ignore_permissions=False)  # obey permissions
 
-    # Fetch created record
-    department = frappe.db.get_value(
-        "Department", doc.name, DEPARTMENT_READ_FIELDS, as_dict=True
-    )
-
     # Send API response
     api_response(
         status_code=201,
         message="Department created successfully.",
-        data=department,
+        data=doc_to_dict(doc, DEPARTMENT_READ_FIELDS),
     )
 
 # UPDATE - Update an existing department
 @frappe.whitelist(allow_guest=False)
+@profiled
+@unit_of_work
 def update_department(*args, **kwargs):
     name = kwargs.get("name")
     department_name = kwargs.get("department_name")
@@ -144,21 +221,46 @@ def update_department(*args, **kwargs):
     doc.department_name = department_name
     doc.company = company
     doc.save()
-    frappe.db.commit()
 
     api_response(
         status_code=200,
         message="Department updated successfully.",
-        data=frappe.db.get_value(
-            "Department", name, DEPARTMENT_READ_FIELDS, as_dict=True
-        ),
+        data=doc_to_dict(doc, DEPARTMENT_READ_FIELDS),
+    )
+
+
+# UPDATE - Move a department to another company
+@frappe.whitelist(allow_guest=False)
+@profiled
+def transfer_department(*args, **kwargs):
+    """Queue moving a Department, and all its employees, to `company`; returns a job id."""
+    name = kwargs.get("name")
+    company = kwargs.get("company")
+    if not name or not company:
+        frappe.throw("Department name and target company are required.")
+
+    if not frappe.has_permission(doctype="Department", ptype="write", doc=name):
+        frappe.throw("Not permitted", frappe.PermissionError)
+
+    if not frappe.db.exists("Company", company):
+        frappe.throw(f"Company '{company}' does not exist.")
+
+    job_id = submit_job(
+        "reassign",
+        "employee_app.employee_app.transfer.transfer_department",
+        description=f"Move department {name} to {company}",
+        department=name,
+        company=company,
     )
+    frappe.response["http_status_code"] = 202
+    return {"message": f"Department '{name}' is being moved to '{company}'.", "job_id": job_id}
 
 
 # DELETE - Remove a department
 @frappe.whitelist(allow_guest=False)
+@profiled
 def delete_department(*args, **kwargs):
-    """Delete a Department."""
+    """Queue deletion of a Department and its employees; returns a job id."""
 
     name = kwargs["name"]
     if not name:
@@ -170,15 +272,20 @@ def delete_department(*args, **kwargs):
     if not frappe.db.exists("Department", name):
         frappe.throw(f"Department '{name}' does not exist.")
 
-    frappe.delete_doc("Department", name)
-    frappe.db.commit()
-
-    return {"message": f"Department '{name}' deleted successfully."}
+    job_id = submit_job(
+        "delete",
+        "employee_app.employee_app.cascade.delete_department",
+        description=f"Delete department {name}",
+        department=name,
+    )
+    frappe.response["http_status_code"] = 202
+    return {"message": f"Department '{name}' is being deleted.", "job_id": job_id}
 
 # GET - Get total count of all departments
 @frappe.whitelist(allow_guest=False)
+@profiled
 def get_all_depratments_count(*args, **kwargs):
     """Get the total count of all departments."""
-    department_count = frappe.db.count("Department")
+    department_count = get_cached("departments_count", lambda: frappe.db.count("Department"))
     return department_count
    
\ No newline at end of file
@@ -1,4 +1,24 @@
 import frappe
+from frappe.utils import add_days, cint, getdate, today
+
+from employee_app.employee_app import transfer
+from employee_app.employee_app.batch import fetch_by_names, parse_names
+from employee_app.employee_app.bulk_import import import_employees, parse_rows
+from employee_app.employee_app.cache import get_cached
+from employee_app.employee_app.export import build_response
+from employee_app.employee_app.jobs import submit_job
+from employee_app.employee_app.pagination import paginate
+from employee_app.employee_app.profiler import profiled
+from employee_app.employee_app.projection import select_fields
+from employee_app.employee_app.responses import api_response, not_modified
+from employee_app.employee_app.search import search_employees as run_search
+from employee_app.employee_app.tenure import (
+    compute_days_employed,
+    days_employed_field,
+    is_days_employed_computed,
+)
+from employee_app.employee_app.transitions import transition_employees as run_transition
+from employee_app.employee_app.utils import doc_to_dict, unit_of_work
 
 EMPLOYEE_READ_FIELDS = [
     "name",
@@ -14,6 +34,14 @@ EMPLOYEE_READ_FIELDS = [
     "days_employed",
     
 ]
+DEFAULT_RECENT_DAYS = 30
+DEFAULT_RECENT_LIMIT = 5
+MAX_RECENT_LIMIT = 100
+# employees per transition_employees call
+MAX_TRANSITION_NAMES = 1000
+# get_recently_hired_employees windows the dashboard polls; these are cached
+CACHED_RECENT_WINDOWS = (7, 30, 90)
+
 EMPLOYEE_WRITE_FIELDS = [
     "employee_name",
     "email_address",
@@ -24,6 +52,63 @@ EMPLOYEE_WRITE_FIELDS = [
     "designation_positiontitle",
 ]
 
+
+def get_employee_read_fields():
+    """EMPLOYEE_READ_FIELDS with days_employed resolved for the site's mode."""
+    return [
+        days_employed_field() if field == "days_employed" else field
+        for field in EMPLOYEE_READ_FIELDS
+    ]
+
+
+def get_employee_record(name, fields=None):
+    """Fetch a single employee with read-safe fields (or the given subset), or None."""
+    employees = frappe.get_all(
+        "Employee", filters={"name": name}, fields=fields or get_employee_read_fields(), limit=1
+    )
+    return employees[0] if employees else None
+
+
+def employee_to_dict(doc):
+    """Read-safe fields of a saved Employee document, without another SELECT."""
+    employee = doc_to_dict(doc, EMPLOYEE_READ_FIELDS)
+    if is_days_employed_computed():
+        employee.days_employed = compute_days_employed(doc.hired_on, doc.workflow_state)
+    return employee
+
+
+def get_recent_hires(since, company=None, limit=DEFAULT_RECENT_LIMIT):
+    """Hired employees with hired_on >= `since`, walked backwards on the state/hired_on index."""
+    filters = {"workflow_state": "Hired", "hired_on": [">=", since]}
+    if company:
+        filters["company"] = company
+    return frappe.get_all(
+        "Employee",
+        filters=filters,
+        fields=get_employee_read_fields(),
+        order_by="hired_on desc, name desc",
+        limit=limit,
+    )
+
+
+def build_employee_filters(**kwargs):
+    """Translate the list API's query params into get_all filters."""
+    filters = []
+    for param, fieldname in (
+        ("company", "company"),
+        ("department", "department"),
+        ("status", "workflow_state"),
+    ):
+        if kwargs.get(param):
+            filters.append(["Employee", fieldname, "=", kwargs[param]])
+
+    if kwargs.get("hired_from"):
+        filters.append(["Employee", "hired_on", ">=", getdate(kwargs["hired_from"])])
+    if kwargs.get("hired_to"):
+        filters.append(["Employee", "hired_on", "<=", getdate(kwargs["hired_to"])])
+    return filters
+
+
 restricted_fields = {
     "status": "Status cannot be set manually. It is automatically updated based on employment status.",
     "hired_on": "Hired On date cannot be set manually. It is automatically set to the current date when the employee is hired.",
@@ -36,57 +121,148 @@ def is_restricted_field(field):
     return field in restricted_fields
 
 
-# API Response Helper Fn
-def api_response(status_code, message, data=None):
-    frappe.local.response["http_status_code"] = status_code
-    frappe.local.response["message"] = message
-    frappe.local.response["data"] = data
-    return frappe.local.response
-
-
 # READ - Get single employee
 @frappe.whitelist(allow_guest=False)
+@profiled
 def get_employee(**kwargs):
     """Get details for a single Employee."""
     name = kwargs.get("name")
     if not name:
         frappe.throw("Employee name is required.")
+    if not_modified(("Employee", {"name": name}), params=kwargs):
+        return
 
-    employee = frappe.db.get_value("Employee", name, EMPLOYEE_READ_FIELDS, as_dict=True)
+    employee = get_employee_record(
+        name, fields=select_fields(kwargs.get("fields"), get_employee_read_fields())
+    )
     if not employee:
         frappe.throw(f"Employee '{name}' not found.")
     return employee
 
 
+# READ - Get many employees by name
+@frappe.whitelist(allow_guest=False)
+@profiled
+def get_employees(*args, **kwargs):
+    """Get several Employees in one call; returns {name: employee} and the names not found."""
+    names = parse_names(kwargs.get("names"))
+    if not_modified(("Employee", {"name": ["in", names]}), params=kwargs):
+        return
+
+    fields = select_fields(kwargs.get("fields"), get_employee_read_fields())
+    employees = fetch_by_names("Employee", fields, names)
+    return {
+        "employees": employees,
+        "missing": [name for name in names if name not in employees],
+    }
+
+
 # READ - List employees
 @frappe.whitelist(allow_guest=False)
+@profiled
 def list_employees(*args, **kwargs):
-    """List all employees"""
-    employees = frappe.get_all("Employee", fields=EMPLOYEE_READ_FIELDS)
-    return employees
+    """List employees one page at a time.
+
+    Optional filters: company, department, status, hired_from, hired_to.
+    `fields` limits the returned columns. Pass the returned `next_cursor`
+    back as `cursor` to get the next page.
+    """
+    filters = build_employee_filters(**kwargs)
+    if not_modified(("Employee", filters), params=kwargs):
+        return
+
+    return paginate(
+        "Employee",
+        fields=select_fields(kwargs.get("fields"), get_employee_read_fields()),
+        filters=filters,
+        cursor=kwargs.get("cursor"),
+        page_size=kwargs.get("page_size"),
+    )
+
+
+# READ - Search employees (typeahead)
+@frappe.whitelist(allow_guest=False)
+@profiled
+def search_employees(*args, **kwargs):
+    """Employees whose name, email, mobile or designation matches `query`, best first.
+
+    Every word of `query` is matched as a prefix. Optional: company,
+    department, limit (default 10, max 50) and fields.
+    """
+    if not frappe.has_permission("Employee", "read"):
+        frappe.throw("Not permitted", frappe.PermissionError)
+
+    return run_search(
+        kwargs.get("query"),
+        fields=select_fields(kwargs.get("fields"), get_employee_read_fields()),
+        company=kwargs.get("company"),
+        department=kwargs.get("department"),
+        limit=kwargs.get("limit"),
+    )
+
+
+# READ - Stream all matching employees as a file
+@frappe.whitelist(allow_guest=False)
+@profiled
+def export_employees(*args, **kwargs):
+    """Stream employees as CSV or JSONL (`format`), optionally gzipped (`gzip=1`).
+
+    Accepts the same filters as list_employees.
+    """
+    if not frappe.has_permission("Employee", "export"):
+        frappe.throw("Not permitted", frappe.PermissionError)
+
+    return build_response(
+        "Employee",
+        fields=select_fields(kwargs.get("fields"), get_employee_read_fields()),
+        filters=build_employee_filters(**kwargs),
+        fmt=kwargs.get("format") or "csv",
+        compress=cint(kwargs.get("gzip")),
+        filename="employees",
+    )
 
 
 # READ - Get employees count
 @frappe.whitelist(allow_guest=False)
+@profiled
 def get_all_employees_count():
     """Get the total number of employees."""
-    employee_count = frappe.db.count("Employee")
+    employee_count = get_cached("employees_count", lambda: frappe.db.count("Employee"))
     return employee_count
 
 
 # read - get recently hired employees
 @frappe.whitelist(allow_guest=False)
-def get_recently_hired_employees():
-    """Get employees hired within the last 'days' days."""
-    # to be done get the real hired employees for now it just retrun last 5 add employees
-    employees = frappe.get_all(
-        "Employee", order_by="creation desc", limit=5, fields=EMPLOYEE_READ_FIELDS
-    )
-    return employees
+@profiled
+def get_recently_hired_employees(*args, **kwargs):
+    """Employees hired in the last `days` days (default 30) or since `since`, newest hire first.
+
+    Optional: company, limit (default 5, max 100). The dashboard windows
+    (7, 30 and 90 days) are served from cache.
+    """
+    since = kwargs.get("since")
+    days = kwargs.get("days")
+    days = DEFAULT_RECENT_DAYS if days in (None, "") else cint(days)
+    if days < 1:
+        frappe.throw("'days' must be at least 1.")
+    limit = max(1, min(cint(kwargs.get("limit")) or DEFAULT_RECENT_LIMIT, MAX_RECENT_LIMIT))
+    company = kwargs.get("company")
+
+    if since:
+        return get_recent_hires(getdate(since), company, limit)
+    if days in CACHED_RECENT_WINDOWS:
+        return get_cached(
+            "recent_hires",
+            lambda: get_recent_hires(add_days(today(), -days), company, limit),
+            params={"days": days, "company": company, "limit": limit, "today": today()},
+        )
+    return get_recent_hires(add_days(today(), -days), company, limit)
 
 
 # CREATE - Add a new employee
 @frappe.whitelist(allow_guest=False)
+@profiled
+@unit_of_work
 def create_employee(*args, **kwargs):
     """Create a new Employee with all required fields."""
 
@@ -108,18 +284,40 @@ def create_employee(*args, **kwargs):
     # Insert the new Employee
     doc = frappe.get_doc(employee_data)
     doc.insert()
-    frappe.db.commit()
 
     # Return the created Employee (read-safe fields only)
     return {
-        "message": frappe.db.get_value(
-            "Employee", doc.name, EMPLOYEE_READ_FIELDS, as_dict=True
-        )
+        "message": employee_to_dict(doc)
     }
 
 
+# CREATE - Bulk import employees
+@frappe.whitelist(allow_guest=False)
+@profiled
+def bulk_import_employees(*args, **kwargs):
+    """Import many employees at once from JSON (`employees`) or CSV (`csv` or an uploaded `file`)."""
+    if not frappe.has_permission("Employee", "create"):
+        frappe.throw("Not permitted", frappe.PermissionError)
+
+    csv_content = kwargs.get("csv")
+    uploaded = frappe.request.files.get("file") if frappe.request and frappe.request.files else None
+    if uploaded:
+        csv_content = uploaded.stream.read()
+
+    rows = parse_rows(employees=kwargs.get("employees"), csv_content=csv_content)
+    result = import_employees(rows, batch_size=kwargs.get("batch_size"))
+
+    api_response(
+        status_code=200 if not result["failed"] else 207,
+        message=f"Imported {result['inserted']} of {result['total']} employees.",
+        data=result,
+    )
+
+
 # UPDATE - Update an existing employee
 @frappe.whitelist(allow_guest=False)
+@profiled
+@unit_of_work
 def update_employee(name, **kwargs):
     """Update an existing Employee."""
     if not name:
@@ -144,16 +342,95 @@ def update_employee(name, **kwargs):
             )
 
     employee.save()
-    frappe.db.commit()
 
     # Return updated employee with read-safe fields
-    return frappe.db.get_value(
-        "Employee", employee.name, EMPLOYEE_READ_FIELDS, as_dict=True
+    return employee_to_dict(employee)
+
+
+# UPDATE - Move employees to another department
+@frappe.whitelist(allow_guest=False)
+@profiled
+def transfer_employees(*args, **kwargs):
+    """Move employees to `department`; their company follows the department.
+
+    Pass `employees` (up to 200 names) to move them in this request, or
+    `from_department` to move everyone in it through a background job
+    (returns a job id). `company`, if given, must match the department's.
+    Named employees the user cannot write are reported in `failed` and left
+    in place (207).
+    """
+    department = kwargs.get("department")
+    if not department:
+        frappe.throw("Target department is required.")
+    if not frappe.has_permission("Employee", "write"):
+        frappe.throw("Not permitted", frappe.PermissionError)
+    company = transfer.get_target_company(department, kwargs.get("company"))
+    check_department_write(department)
+
+    from_department = kwargs.get("from_department")
+    if from_department:
+        check_department_write(from_department)
+        job_id = submit_job(
+            "reassign",
+            "employee_app.employee_app.transfer.transfer_employees",
+            description=f"Move employees of {from_department} to {department}",
+            department=department,
+            from_department=from_department,
+            company=company,
+        )
+        frappe.response["http_status_code"] = 202
+        return {"message": f"Employees of '{from_department}' are being moved.", "job_id": job_id}
+
+    names = parse_names(kwargs.get("employees"))
+    # user permissions, as update_employee's document-level check
+    permitted = set(frappe.get_list("Employee", filters={"name": ["in", names]}, pluck="name", limit=0))
+    if not permitted:
+        frappe.throw("Not permitted", frappe.PermissionError)
+
+    result = transfer.transfer_employees(
+        department, employees=[name for name in names if name in permitted], company=company
     )
+    result["failed"] = [
+        {"name": name, "error": "Employee not found or not permitted."}
+        for name in names
+        if name not in permitted
+    ]
+    if result["failed"]:
+        frappe.response["http_status_code"] = 207
+    return result
+
+
+def check_department_write(department):
+    """Throw unless the user may write `department` (its company's user permissions included)."""
+    if not frappe.has_permission("Department", "write", doc=department):
+        frappe.throw(f"Not permitted to move employees into or out of {department}.", frappe.PermissionError)
+
+
+# UPDATE - Apply a workflow action to many employees
+@frappe.whitelist(allow_guest=False)
+@profiled
+def transition_employees(*args, **kwargs):
+    """Apply workflow `action` (e.g. "Hire") to up to 1000 `employees` with one commit.
+
+    Each transition is checked against the Employee workflow. Rows that
+    cannot make it are reported per name and left as they are; the response
+    is 207 when some rows failed.
+    """
+    action = kwargs.get("action")
+    if not action:
+        frappe.throw("Workflow action is required.")
+    if not frappe.has_permission("Employee", "write"):
+        frappe.throw("Not permitted", frappe.PermissionError)
+
+    result = run_transition(parse_names(kwargs.get("employees"), limit=MAX_TRANSITION_NAMES), action)
+    if result["failed"]:
+        frappe.response["http_status_code"] = 207
+    return result
 
 
 # DELETE - Remove an employee
 @frappe.whitelist(allow_guest=False)
+@profiled
 def delete_employee(**kwargs):
     """Delete an Employee."""
     frappe.throw("Not permitted", frappe.PermissionError)
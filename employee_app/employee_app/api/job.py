@@ -0,0 +1,37 @@
+import frappe
+
+from employee_app.employee_app.jobs import get_job
+from employee_app.employee_app.profiler import profiled
+from employee_app.employee_app.responses import api_response
+
+
+# READ - Get background job status
+@frappe.whitelist(allow_guest=False)
+@profiled
+def get_job_status(*args, **kwargs):
+    """Status, progress, rows processed and errors of a queued job."""
+    job_id = kwargs.get("job_id")
+    if not job_id:
+        api_response(
+            status_code=400,
+            message="Job id is required.",
+            data=None
+        )
+        return
+
+    job = get_job(job_id)
+    if not job or (
+        job.get("user") != frappe.session.user and "System Manager" not in frappe.get_roles()
+    ):
+        api_response(
+            status_code=404,
+            message=f"Job '{job_id}' not found.",
+            data=None
+        )
+        return
+
+    api_response(
+        status_code=200,
+        message=f"Job '{job_id}' is {job['status']}.",
+        data=job
+    )
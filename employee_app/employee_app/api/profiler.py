@@ -0,0 +1,29 @@
+import frappe
+
+from employee_app.employee_app.profiler import get_stats, is_enabled, reset_stats
+from employee_app.employee_app.responses import api_response
+
+
+# READ - Per-endpoint query statistics
+@frappe.whitelist(allow_guest=False)
+def get_profile_stats(*args, **kwargs):
+    """Query count, DB time, rows, commits and wall-time percentiles per endpoint."""
+    frappe.only_for("System Manager")
+    api_response(
+        status_code=200,
+        message="Profiler statistics retrieved successfully.",
+        data={"enabled": is_enabled(), "endpoints": get_stats()}
+    )
+
+
+# DELETE - Reset collected statistics
+@frappe.whitelist(allow_guest=False)
+def reset_profile_stats(*args, **kwargs):
+    """Clear all collected profiler statistics."""
+    frappe.only_for("System Manager")
+    reset_stats()
+    api_response(
+        status_code=200,
+        message="Profiler statistics cleared.",
+        data=None
+    )
@@ -0,0 +1,18 @@
+import frappe
+
+from employee_app.employee_app.profiler import profiled
+from employee_app.employee_app.sync import get_changes as _get_changes
+
+
+# READ - Changes since the client's last sync
+@frappe.whitelist(allow_guest=False)
+@profiled
+def get_changes(*args, **kwargs):
+    """Employees, departments and companies created, modified or deleted since `sync_token`.
+
+    Omit `sync_token` for a full sync. Keep calling with the returned
+    `sync_token` while `has_more` is true (`page_size` rows per collection,
+    default 200, max 1000). A token older than the tombstone retention
+    window gets a 410 and the client must sync from scratch.
+    """
+    return _get_changes(kwargs.get("sync_token"), kwargs.get("page_size"))
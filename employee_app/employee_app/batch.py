@@ -0,0 +1,73 @@
+# Copyright (c) 2025, Mostafa K. and contributors
+# For license information, please see license.txt
+
+import frappe
+
+from employee_app.employee_app.projection import parse_list
+
+MAX_NAMES = 200
+
+
+def parse_names(names, limit=MAX_NAMES):
+    """Names from a JSON list, a Python list or a comma-separated string; de-duplicated, in order."""
+    names = list(dict.fromkeys(parse_list(names)))
+
+    if not names:
+        frappe.throw("At least one name is required.")
+    if len(names) > limit:
+        frappe.throw(f"At most {limit} names can be passed per call.")
+    return names
+
+
+def fetch_by_names(doctype, fields, names):
+    """{name: record} for every existing name the user can read, resolved with one IN (...) query."""
+    rows = frappe.get_list(doctype, filters={"name": ["in", names]}, fields=fields, limit=0)
+    return {row.name: row for row in rows}
+
+
+def fetch_related(doctype, fields, parent_field, parents, limit=None):
+    """Up to `limit` newest `doctype` rows per parent (all of them without a limit), in one query.
+
+    Returns ({parent: rows}, {parent: has_more}), has_more being True when
+    the cap left rows out. ROW_NUMBER() over a partition per parent caps
+    each parent's share inside the database instead of fetching every child
+    and trimming in Python. Rows are filtered by the same user permissions
+    and permission query conditions as frappe.get_list, like the parents
+    from `fetch_by_names`.
+    """
+    related = {parent: [] for parent in parents}
+    has_more = dict.fromkeys(parents, False)
+    if not parents:
+        return related, has_more
+    if not frappe.has_permission(doctype, "read"):
+        frappe.throw("Not permitted", frappe.PermissionError)
+
+    query, params = build_related_query(doctype, fields, parent_field, parents, limit)
+    for row in frappe.db.sql(query, params, as_dict=True):
+        parent = row.pop("_parent")
+        row.pop("_rank")
+        total = row.pop("_total")
+        has_more[parent] = bool(limit) and total > limit
+        related[parent].append(row)
+    return related, has_more
+
+
+def build_related_query(doctype, fields, parent_field, parents, limit=None):
+    """(SQL, params) of `fetch_related`; also EXPLAINed by indexes.py."""
+    from frappe.desk.reportview import get_match_cond
+
+    query = f"""
+        SELECT * FROM (
+            SELECT {", ".join(fields)},
+                `{parent_field}` AS _parent,
+                ROW_NUMBER() OVER (
+                    PARTITION BY `{parent_field}` ORDER BY `creation` DESC, `name` DESC
+                ) AS _rank,
+                COUNT(*) OVER (PARTITION BY `{parent_field}`) AS _total
+            FROM `tab{doctype}`
+            WHERE `{parent_field}` IN %(parents)s {get_match_cond(doctype)}
+        ) ranked
+        {"WHERE _rank <= %(limit)s" if limit else ""}
+        ORDER BY _parent, _rank
+    """
+    return query, {"parents": list(parents), "limit": limit}
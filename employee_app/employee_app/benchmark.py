@@ -0,0 +1,404 @@
+# Copyright (c) 2025, Mostafa K. and contributors
+# For license information, please see license.txt
+
+"""Synthetic-tenant benchmark for the app's API endpoints.
+
+Run with `bench --site <site> employee-app-benchmark`. Every generated record
+is prefixed with BENCH_PREFIX and removed when the run finishes.
+"""
+
+import itertools
+import json
+import random
+import statistics
+import time
+
+import frappe
+from frappe.utils import now, today
+
+from employee_app.employee_app.bulk_import import import_employees
+from employee_app.employee_app.cascade import delete_company_cascade
+from employee_app.employee_app.jobs import update_job
+from employee_app.employee_app.profiler import profile
+from employee_app.employee_app.statistics import rebuild_statistics
+
+BENCH_PREFIX = "_Bench"
+# LIKE pattern for bench records; "_" is escaped so it is not a wildcard.
+BENCH_LIKE = "\\_Bench%"
+PERCENTILES = (50, 90, 95, 99)
+# Share of generated employees moved to Hired, with hired_on in the last 5 years.
+HIRED_RATIO = 0.6
+# Companies of the sized tenant only, not the write tenant's.
+TENANT_COMPANY_LIKE = "\\_Bench Company %"
+# Write endpoints run against this company, so the sized tenant never changes
+# between calls. Records it gets are numbered well above any generated tenant.
+WRITE_COMPANY = f"{BENCH_PREFIX} Write Company"
+WRITE_SEQUENCE_START = 10_000_000
+# Left out of get_endpoints(): delete_employee always refuses, and
+# reset_profile_stats would wipe the site's collected profiles.
+EXCLUDED_ENDPOINTS = ("employee.delete_employee", "profiler.reset_profile_stats")
+
+_sequence = itertools.count(WRITE_SEQUENCE_START)
+
+
+def employee_row(i, department, company, designation="Engineer"):
+    return {
+        "employee_name": f"{BENCH_PREFIX} Employee {i}",
+        "email_address": f"bench.employee.{i}@example.com",
+        "mobile_number": f"+2010{i:08d}",
+        "address": "Benchmark Street",
+        "designation_positiontitle": designation,
+        "department": department,
+        "company": company,
+    }
+
+
+def generate_tenant(companies, departments_per_company, employees, seed=42):
+    """Create N companies x M departments and top employees up to `employees` in total.
+
+    Calling it again with a larger `employees` only inserts the difference,
+    so a run can grow one tenant through increasing sizes.
+    """
+    rng = random.Random(seed)
+    departments = []
+    for c in range(companies):
+        company = f"{BENCH_PREFIX} Company {c}"
+        if not frappe.db.exists("Company", company):
+            frappe.get_doc({"doctype": "Company", "company_name": company}).insert(ignore_permissions=True)
+        for d in range(departments_per_company):
+            name = frappe.db.get_value("Department", {"department_name": f"Dept {d}", "company": company})
+            if not name:
+                name = frappe.get_doc(
+                    {"doctype": "Department", "department_name": f"Dept {d}", "company": company}
+                ).insert(ignore_permissions=True).name
+            departments.append((name, company))
+    frappe.db.commit()
+
+    existing = frappe.db.count("Employee", {"company": ["like", TENANT_COMPANY_LIKE]})
+    rows = []
+    for i in range(existing, employees):
+        department, company = departments[i % len(departments)]
+        designation = rng.choice(["Engineer", "Analyst", "Manager", "Designer"])
+        rows.append(employee_row(i, department, company, designation))
+    if rows:
+        import_employees(rows, batch_size=5000)
+        _hire_some(rng)
+    return {"companies": companies, "departments": len(departments), "employees": employees}
+
+
+def _hire_some(rng):
+    """Move a share of not-yet-hired bench employees to Hired with a spread of hire dates."""
+    names = frappe.get_all(
+        "Employee",
+        filters={"company": ["like", TENANT_COMPANY_LIKE], "hired_on": ["is", "not set"]},
+        pluck="name",
+        limit=0,
+    )
+    hired = [name for name in names if rng.random() < HIRED_RATIO]
+    for start in range(0, len(hired), 5000):
+        chunk = hired[start : start + 5000]
+        frappe.db.sql(
+            """
+            UPDATE `tabEmployee`
+            SET `workflow_state` = 'Hired', `status` = 'Hired',
+                `hired_on` = DATE_SUB(%(today)s, INTERVAL FLOOR(RAND() * 1825) DAY)
+            WHERE `name` IN %(names)s
+            """,
+            {"today": today(), "names": chunk},
+        )
+    # the raw UPDATE bypasses the hooks that keep statistics current
+    rebuild_statistics()
+    frappe.db.commit()
+
+
+def cleanup():
+    for company in frappe.get_all("Company", filters={"name": ["like", BENCH_LIKE]}, pluck="name"):
+        delete_company_cascade(company)
+
+
+def _make_company(company_name):
+    return frappe.get_doc({"doctype": "Company", "company_name": company_name}).insert(
+        ignore_permissions=True
+    ).name
+
+
+def _make_department(department_name, company):
+    return frappe.get_doc(
+        {"doctype": "Department", "department_name": department_name, "company": company}
+    ).insert(ignore_permissions=True).name
+
+
+def _make_employee(department, company):
+    return frappe.get_doc(
+        {"doctype": "Employee", **employee_row(next(_sequence), department, company)}
+    ).insert(ignore_permissions=True).name
+
+
+def generate_write_tenant():
+    """The company and two departments the write endpoints create into and move between."""
+    if not frappe.db.exists("Company", WRITE_COMPANY):
+        _make_company(WRITE_COMPANY)
+    departments = []
+    for department_name in ("Write From", "Write To"):
+        name = frappe.db.get_value(
+            "Department", {"department_name": department_name, "company": WRITE_COMPANY}
+        )
+        departments.append(name or _make_department(department_name, WRITE_COMPANY))
+    frappe.db.commit()
+    return departments
+
+
+def _get_transition():
+    """(action, state) of a workflow action available from the state new employees start in."""
+    from frappe.model.workflow import get_workflow, get_workflow_name
+
+    if not get_workflow_name("Employee"):
+        return None
+    workflow = get_workflow("Employee")
+    initial = workflow.states[0].state if workflow.states else None
+    for transition in workflow.transitions:
+        if transition.state == initial and not transition.condition:
+            return transition.action
+    return None
+
+
+def get_endpoints():
+    """(label, callable[, setup]) for every API endpoint and the tenure task.
+
+    Reads are bound to sample records of the sized tenant. Writes run
+    against the write tenant; when an endpoint consumes a record (delete,
+    transfer, transition), `setup` creates a fresh one before each call,
+    outside the timed frame, and its return value is passed to the callable.
+    See EXCLUDED_ENDPOINTS for what is left out.
+    """
+    from employee_app import tasks
+    from employee_app.employee_app.api import company, dashboard, department, employee, job, profiler, sync
+
+    sample_company = f"{BENCH_PREFIX} Company 0"
+    sample_department = frappe.db.get_value("Department", {"company": sample_company}, "name")
+    sample_employee = frappe.db.get_value(
+        "Employee", {"company": sample_company}, ["name", *employee.EMPLOYEE_WRITE_FIELDS], as_dict=True
+    )
+    employee_update = {field: sample_employee[field] for field in employee.EMPLOYEE_WRITE_FIELDS}
+    companies = frappe.get_all("Company", {"name": ["like", TENANT_COMPANY_LIKE]}, pluck="name", limit=20)
+    departments = frappe.get_all("Department", {"company": sample_company}, pluck="name", limit=20)
+    employees = frappe.get_all("Employee", {"company": sample_company}, pluck="name", limit=50)
+
+    from_department, to_department = generate_write_tenant()
+    job_id = frappe.generate_hash(length=12)
+    update_job(job_id, job_id=job_id, status="finished", user=frappe.session.user)
+
+    def export(**kwargs):
+        # the body is streamed after the handler returns; time producing all of it
+        return b"".join(employee.export_employees(company=sample_company, **kwargs).response)
+
+    def fresh_company():
+        return _make_company(f"{WRITE_COMPANY} {next(_sequence)}")
+
+    def fresh_department():
+        return _make_department(f"Write {next(_sequence)}", WRITE_COMPANY)
+
+    def fresh_employees(count=10):
+        return [_make_employee(from_department, WRITE_COMPANY) for _ in range(count)]
+
+    endpoints = [
+        # Employee reads
+        ("employee.get_employee", lambda: employee.get_employee(name=sample_employee.name)),
+        ("employee.get_employees", lambda: employee.get_employees(names=employees)),
+        ("employee.list_employees", lambda: employee.list_employees(page_size=20)),
+        ("employee.list_employees?company", lambda: employee.list_employees(company=sample_company)),
+        ("employee.search_employees", lambda: employee.search_employees(query="Bench Employee 1")),
+        ("employee.search_employees?short", lambda: employee.search_employees(query="Be")),
+        ("employee.export_employees", export),
+        ("employee.export_employees?gzip", lambda: export(format="jsonl", gzip=1)),
+        ("employee.get_all_employees_count", employee.get_all_employees_count),
+        ("employee.get_recently_hired_employees", employee.get_recently_hired_employees),
+        (
+            "employee.get_recently_hired_employees?days",
+            lambda: employee.get_recently_hired_employees(days=45),
+        ),
+        # Employee writes
+        (
+            "employee.create_employee",
+            lambda: employee.create_employee(
+                **employee_row(next(_sequence), from_department, WRITE_COMPANY)
+            ),
+        ),
+        (
+            "employee.bulk_import_employees",
+            lambda: employee.bulk_import_employees(
+                employees=[
+                    employee_row(next(_sequence), from_department, WRITE_COMPANY) for _ in range(100)
+                ]
+            ),
+        ),
+        (
+            "employee.update_employee",
+            lambda: employee.update_employee(sample_employee.name, **employee_update),
+        ),
+        (
+            "employee.transfer_employees",
+            lambda names: employee.transfer_employees(department=to_department, employees=names),
+            fresh_employees,
+        ),
+        (
+            "employee.transfer_employees?from_department",
+            lambda: employee.transfer_employees(department=to_department, from_department=from_department),
+        ),
+        # Company reads
+        ("company.get_company", lambda: company.get_company(name=sample_company)),
+        (
+            "company.get_companies",
+            lambda: company.get_companies(names=companies, include="departments,employees"),
+        ),
+        ("company.list_companies", lambda: company.list_companies(page_size=20)),
+        (
+            "company.get_company_related_departments",
+            lambda: company.get_company_related_departments(company=sample_company),
+        ),
+        (
+            "company.get_company_related_employee",
+            lambda: company.get_company_related_employee(company=sample_company),
+        ),
+        ("company.get_all_companies_count", company.get_all_companies_count),
+        # Company writes
+        (
+            "company.create_company",
+            lambda: company.create_company(company_name=f"{WRITE_COMPANY} {next(_sequence)}"),
+        ),
+        (
+            "company.update_company",
+            lambda: company.update_company(name=WRITE_COMPANY, company_name=WRITE_COMPANY),
+        ),
+        ("company.delete_company", lambda name: company.delete_company(name=name), fresh_company),
+        ("company.reconcile_counters", company.reconcile_counters),
+        # Department reads
+        ("department.get_department", lambda: department.get_department(name=sample_department)),
+        (
+            "department.get_departments",
+            lambda: department.get_departments(names=departments, include="employees"),
+        ),
+        ("department.list_departments", lambda: department.list_departments(page_size=20)),
+        (
+            "department.get_department_related_employees",
+            lambda: department.get_department_related_employees(
+                department=sample_department, company=sample_company
+            ),
+        ),
+        ("department.get_all_depratments_count", department.get_all_depratments_count),
+        # Department writes
+        (
+            "department.create_department",
+            lambda: department.create_department(
+                department_name=f"Write {next(_sequence)}", company=WRITE_COMPANY
+            ),
+        ),
+        (
+            "department.update_department",
+            lambda: department.update_department(
+                name=to_department, department_name="Write To", company=WRITE_COMPANY
+            ),
+        ),
+        (
+            "department.transfer_department",
+            lambda name: department.transfer_department(name=name, company=sample_company),
+            fresh_department,
+        ),
+        ("department.delete_department", lambda name: department.delete_department(name=name), fresh_department),
+        # Dashboard, jobs, sync, profiler
+        ("dashboard.get_dashboard_stats", dashboard.get_dashboard_stats),
+        ("dashboard.get_cache_stats", dashboard.get_cache_stats),
+        ("job.get_job_status", lambda: job.get_job_status(job_id=job_id)),
+        ("sync.get_changes", lambda: sync.get_changes(page_size=200)),
+        ("profiler.get_profile_stats", profiler.get_profile_stats),
+        ("tasks.update_days_employed_for_all", tasks.update_days_employed_for_all),
+    ]
+
+    action = _get_transition()
+    if action:
+        endpoints.append(
+            (
+                "employee.transition_employees",
+                lambda names: employee.transition_employees(employees=names, action=action),
+                fresh_employees,
+            )
+        )
+    return endpoints
+
+
+def _percentile(values, percentile):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(percentile / 100 * len(ordered)) - 1))
+    return round(ordered[index], 3)
+
+
+def time_endpoint(label, fn, repeat, setup=None):
+    latencies, frames = [], []
+    for _ in range(repeat):
+        args = (setup(),) if setup else ()
+        with profile(label, force=True, persist=False) as frame:
+            fn(*args)
+        frappe.db.rollback()
+        latencies.append(frame["wall_ms"])
+        frames.append(frame)
+
+    return {
+        "endpoint": label,
+        "calls": repeat,
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies), 3),
+            **{f"p{p}": _percentile(latencies, p) for p in PERCENTILES},
+        },
+        "queries_per_call": round(statistics.fmean(f["queries"] for f in frames), 2),
+        "rows_per_call": round(statistics.fmean(f["rows"] for f in frames), 2),
+        "commits_per_call": round(statistics.fmean(f["commits"] for f in frames), 2),
+        "db_time_ms_per_call": round(statistics.fmean(f["db_time_ms"] for f in frames), 3),
+    }
+
+
+def run(sizes, companies=5, departments_per_company=10, repeat=20, keep_data=False):
+    """Benchmark every endpoint at each tenant size; returns a JSON-serialisable report."""
+    report = {"started_at": now(), "site": frappe.local.site, "runs": []}
+    try:
+        for size in sorted(sizes):
+            started = time.monotonic()
+            tenant = generate_tenant(companies, departments_per_company, size)
+            tenant["generate_seconds"] = round(time.monotonic() - started, 3)
+            results = [time_endpoint(*endpoint[:2], repeat, *endpoint[2:]) for endpoint in get_endpoints()]
+            report["runs"].append({"tenant": tenant, "results": results})
+    finally:
+        if not keep_data:
+            cleanup()
+    report["finished_at"] = now()
+    return report
+
+
+def compare(baseline, current, tolerance=1.2):
+    """Regressions of `current` against `baseline`: p95 or queries/call above `tolerance` x."""
+    def index(report):
+        return {
+            (run["tenant"]["employees"], result["endpoint"]): result
+            for run in report["runs"]
+            for result in run["results"]
+        }
+
+    before, after = index(baseline), index(current)
+    regressions = []
+    for key, result in after.items():
+        previous = before.get(key)
+        if not previous:
+            continue
+        for metric, old, new in (
+            ("p95_ms", previous["latency_ms"]["p95"], result["latency_ms"]["p95"]),
+            ("queries_per_call", previous["queries_per_call"], result["queries_per_call"]),
+        ):
+            if old and new > old * tolerance:
+                regressions.append(
+                    {"employees": key[0], "endpoint": key[1], "metric": metric, "before": old, "after": new}
+                )
+    return regressions
+
+
+def load_report(path):
+    with open(path) as f:
+        return json.load(f)
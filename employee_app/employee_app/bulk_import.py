@@ -0,0 +1,157 @@
+# Copyright (c) 2025, Mostafa K. and contributors
+# For license information, please see license.txt
+
+import csv
+import io
+import json
+import time
+from collections import Counter
+
+import frappe
+from frappe.utils import cint, now, validate_email_address
+
+from employee_app.employee_app import counters, department_map, statistics, sync
+from employee_app.employee_app.cache import INVALIDATES, invalidate
+
+DEFAULT_BATCH_SIZE = 500
+MAX_BATCH_SIZE = 5000
+DEFAULT_INITIAL_STATE = "Application Received"
+
+
+def parse_rows(employees=None, csv_content=None):
+    """Accept a JSON list (or JSON string) of employee dicts, or CSV text with a header row."""
+    if employees is not None:
+        rows = json.loads(employees) if isinstance(employees, str) else employees
+        if not isinstance(rows, list):
+            frappe.throw("'employees' must be a list of employee records.")
+        return rows
+
+    if csv_content is not None:
+        if isinstance(csv_content, bytes):
+            csv_content = csv_content.decode("utf-8-sig")
+        return list(csv.DictReader(io.StringIO(csv_content)))
+
+    frappe.throw("Provide either 'employees' (JSON) or a CSV file.")
+
+
+def get_initial_state():
+    """First state of the active Employee workflow, as a normal insert would set it."""
+    from frappe.model.workflow import get_workflow_name
+
+    workflow = get_workflow_name("Employee")
+    if workflow:
+        state = frappe.db.get_value(
+            "Workflow Document State", {"parent": workflow, "idx": 1}, "state"
+        )
+        if state:
+            return state
+    return DEFAULT_INITIAL_STATE
+
+
+def load_department_companies(rows):
+    """Department -> company map for every department referenced by `rows`."""
+    return department_map.get_companies_for(row.get("department") for row in rows if row.get("department"))
+
+
+def validate_row(row, department_companies):
+    """Return a list of error messages for one input row (empty if valid)."""
+    from employee_app.employee_app.api.employee import EMPLOYEE_WRITE_FIELDS, is_restricted_field
+
+    errors = [f"Missing required field: {field}" for field in EMPLOYEE_WRITE_FIELDS if not row.get(field)]
+    errors += [
+        f"{field} cannot be set manually. It is updated automatically."
+        for field in row
+        if is_restricted_field(field)
+    ]
+
+    if row.get("email_address") and not validate_email_address(row["email_address"]):
+        errors.append(f"Invalid email address: {row['email_address']}")
+
+    department = row.get("department")
+    if department:
+        dept_company = department_companies.get(department)
+        if not dept_company:
+            errors.append(f"Department {department} does not exist.")
+        elif dept_company != row.get("company"):
+            errors.append(f"Department {department} belongs to company {dept_company}, not {row.get('company')}.")
+    return errors
+
+
+def import_employees(rows, batch_size=None):
+    """Validate and insert employee rows with multi-row INSERTs, one transaction per batch.
+
+    Returns counts, a per-row error report (1-based row numbers) and throughput.
+    """
+    from employee_app.employee_app.api.employee import EMPLOYEE_WRITE_FIELDS
+
+    batch_size = max(1, min(cint(batch_size) or DEFAULT_BATCH_SIZE, MAX_BATCH_SIZE))
+    started = time.monotonic()
+    department_companies = load_department_companies(rows)
+    initial_state = get_initial_state()
+    user = frappe.session.user
+
+    fields = [
+        "name", "creation", "modified", "owner", "modified_by", "docstatus",
+        "workflow_state", "status", "days_employed", *EMPLOYEE_WRITE_FIELDS,
+    ]
+    inserted, errors = 0, []
+
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start : start + batch_size]
+        values, row_numbers = [], []
+        department_delta, company_delta = Counter(), Counter()
+        statistics_delta = statistics.StatisticsDelta()
+        # released by this batch's commit / rollback
+        sync.hold_changes()
+
+        for offset, row in enumerate(batch):
+            row_number = start + offset + 1
+            row_errors = validate_row(row, department_companies)
+            if row_errors:
+                errors.append({"row": row_number, "errors": row_errors})
+                continue
+
+            timestamp = now()
+            values.append(
+                [
+                    frappe.generate_hash(length=10), timestamp, timestamp, user, user, 0,
+                    initial_state, initial_state, 0,
+                    *(row[field] for field in EMPLOYEE_WRITE_FIELDS),
+                ]
+            )
+            row_numbers.append(row_number)
+            department_delta[row["department"]] += 1
+            company_delta[row["company"]] += 1
+            statistics_delta.add(row["company"], row["department"], initial_state)
+
+        if not values:
+            continue
+
+        try:
+            frappe.db.bulk_insert("Employee", fields, values)
+            # one delta per parent per batch, in the same transaction as the rows
+            for department, count in department_delta.items():
+                counters.apply_delta("Department", department, "number_of_employees", count)
+            for company, count in company_delta.items():
+                counters.apply_delta("Company", company, "number_of_employees", count)
+            statistics_delta.apply()
+            frappe.db.commit()
+            inserted += len(values)
+        except Exception as e:
+            frappe.db.rollback()
+            frappe.log_error(message=frappe.get_traceback(), title="Employee Bulk Import Batch Failed")
+            errors.extend({"row": row_number, "errors": [str(e)]} for row_number in row_numbers)
+
+    if inserted:
+        invalidate(*INVALIDATES["Employee"])
+        frappe.db.commit()
+
+    elapsed = time.monotonic() - started
+    return {
+        "total": len(rows),
+        "inserted": inserted,
+        "failed": len(rows) - inserted,
+        "errors": sorted(errors, key=lambda error: error["row"]),
+        "elapsed": round(elapsed, 3),
+        "rows_per_second": round(inserted / elapsed, 1) if elapsed else None,
+    }
@@ -0,0 +1,97 @@
+# Copyright (c) 2025, Mostafa K. and contributors
+# For license information, please see license.txt
+
+import hashlib
+import json
+
+import frappe
+from frappe.utils import cint
+
+CACHE_PREFIX = "employee_app"
+DEFAULT_TTL = 300
+
+# Which cached groups go stale when a document of each doctype changes.
+INVALIDATES = {
+    "Employee": ("dashboard", "employees_count", "employee_report", "recent_hires"),
+    "Department": ("dashboard", "departments_count", "employee_report"),
+    "Company": ("dashboard", "companies_count", "employee_report", "recent_hires"),
+}
+
+
+def get_ttl():
+    return cint(frappe.conf.get("employee_app_cache_ttl")) or DEFAULT_TTL
+
+
+def _generation_key(group):
+    return f"{CACHE_PREFIX}:generation:{group}"
+
+
+def _counter_key(group, outcome):
+    return frappe.cache.make_key(f"{CACHE_PREFIX}:stats:{group}:{outcome}")
+
+
+def _get_generation(group):
+    return frappe.cache.get_value(_generation_key(group)) or "0"
+
+
+def _make_key(group, params):
+    digest = hashlib.md5(
+        json.dumps(params or {}, sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return f"{CACHE_PREFIX}:{group}:{_get_generation(group)}:{digest}"
+
+
+def get_cached(group, generator, params=None, ttl=None):
+    """Return the cached value for (group, params), computing it on a miss.
+
+    Every key embeds the group's generation token, so invalidate() drops a
+    whole group at once without scanning Redis for matching keys.
+    """
+    key = _make_key(group, params)
+    value = frappe.cache.get_value(key)
+    if value is not None:
+        frappe.cache.incr(_counter_key(group, "hits"))
+        return value
+
+    frappe.cache.incr(_counter_key(group, "misses"))
+    value = generator()
+    frappe.cache.set_value(key, value, expires_in_sec=ttl or get_ttl())
+    return value
+
+
+def invalidate(*groups):
+    """Start a new generation for each group once the current transaction commits."""
+
+    def _bump():
+        for group in groups:
+            frappe.cache.set_value(_generation_key(group), frappe.generate_hash(length=10))
+
+    frappe.db.after_commit.add(_bump)
+
+
+def invalidate_for_doc(doc, method=None):
+    """doc_events handler: drop the cached groups that depend on `doc.doctype`."""
+    groups = INVALIDATES.get(doc.doctype)
+    if groups:
+        invalidate(*groups)
+
+
+def get_cache_stats():
+    """Hit / miss counters per cached group since the counters were last reset."""
+    stats = {}
+    groups = sorted({group for groups in INVALIDATES.values() for group in groups})
+    for group in groups:
+        hits = cint(frappe.cache.get(_counter_key(group, "hits")))
+        misses = cint(frappe.cache.get(_counter_key(group, "misses")))
+        total = hits + misses
+        stats[group] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / total, 4) if total else None,
+        }
+    return stats
+
+
+def reset_cache_stats():
+    for group in get_cache_stats():
+        frappe.cache.delete(_counter_key(group, "hits"), _counter_key(group, "misses"))
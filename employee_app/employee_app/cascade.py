@@ -0,0 +1,140 @@
+# Copyright (c) 2025, Mostafa K. and contributors
+# For license information, please see license.txt
+
+import frappe
+
+from employee_app.employee_app import counters, department_map, statistics, sync
+from employee_app.employee_app.cache import INVALIDATES, invalidate
+from employee_app.employee_app.jobs import no_progress
+from employee_app.employee_app.utils import affected_rows
+
+# Framework tables that keep per-document rows for tracked doctypes
+# (track_changes, comments, track_views), as (doctype, ref doctype column, ref name column).
+DEPENDENT_TABLES = [
+    ("Version", "ref_doctype", "docname"),
+    ("Comment", "reference_doctype", "reference_name"),
+    ("View Log", "reference_doctype", "reference_name"),
+]
+
+_COMPANY_DEPARTMENTS = "SELECT `name` FROM `tabDepartment` WHERE `company` = %(company)s"
+
+
+def delete_where(doctype, condition, params):
+    """Delete every `doctype` row matching `condition`, plus its framework dependents.
+
+    Set-based: no documents are loaded and no hooks run, so callers are
+    responsible for counters and cache invalidation. Sync tombstones are
+    recorded here. Returns rows deleted.
+    """
+    sync.hold_changes()
+    sync.record_tombstones_where(doctype, condition, params)
+    for dependent, doctype_column, name_column in DEPENDENT_TABLES:
+        frappe.db.sql(
+            f"""
+            DELETE FROM `tab{dependent}`
+            WHERE `{doctype_column}` = %(_doctype)s
+                AND `{name_column}` IN (SELECT `name` FROM `tab{doctype}` WHERE {condition})
+            """,
+            {**params, "_doctype": doctype},
+        )
+
+    frappe.db.sql(f"DELETE FROM `tab{doctype}` WHERE {condition}", params)
+    return affected_rows()
+
+
+def _decrement_grouped(query, params, doctype, fieldname):
+    """Apply one negative delta per parent returned by a (parent, count) grouped query."""
+    for parent, count in frappe.db.sql(query, params):
+        counters.apply_delta(doctype, parent, fieldname, -count)
+
+
+def delete_department_employees(department):
+    """Delete all employees of a department that is itself being deleted."""
+    params = {"department": department}
+    _decrement_grouped(
+        """
+        SELECT `company`, COUNT(*) FROM `tabEmployee`
+        WHERE `department` = %(department)s
+        GROUP BY `company`
+        """,
+        params,
+        "Company",
+        "number_of_employees",
+    )
+    deleted = delete_where("Employee", "`department` = %(department)s", params)
+    statistics.delete_where("`department` = %(department)s", params)
+    if deleted:
+        invalidate(*INVALIDATES["Employee"])
+    return deleted
+
+
+def delete_company_cascade(company, progress=None, commit=True):
+    """Delete a company with all its departments and employees in one transaction.
+
+    Employees belonging to the company, or to any of its departments, are
+    removed with set-based DELETEs. Counters on the company's own
+    departments die with them; the only counters adjusted are those of
+    *other* parents that had misaligned employees, one delta each.
+    """
+    params = {"company": company}
+    progress = progress or no_progress
+
+    progress(5, "Adjusting counters")
+    _decrement_grouped(
+        f"""
+        SELECT `company`, COUNT(*) FROM `tabEmployee`
+        WHERE `company` != %(company)s AND `department` IN ({_COMPANY_DEPARTMENTS})
+        GROUP BY `company`
+        """,
+        params,
+        "Company",
+        "number_of_employees",
+    )
+    _decrement_grouped(
+        f"""
+        SELECT `department`, COUNT(*) FROM `tabEmployee`
+        WHERE `company` = %(company)s AND `department` NOT IN ({_COMPANY_DEPARTMENTS})
+        GROUP BY `department`
+        """,
+        params,
+        "Department",
+        "number_of_employees",
+    )
+
+    progress(20, "Deleting employees")
+    employees = delete_where(
+        "Employee",
+        f"`company` = %(company)s OR `department` IN ({_COMPANY_DEPARTMENTS})",
+        params,
+    )
+
+    statistics.delete_where(
+        f"`company` = %(company)s OR `department` IN ({_COMPANY_DEPARTMENTS})", params
+    )
+
+    progress(70, "Deleting departments", employees)
+    for department in frappe.db.sql_list(_COMPANY_DEPARTMENTS, params):
+        department_map.remember(department, None)
+    departments = delete_where("Department", "`company` = %(company)s", params)
+
+    progress(90, "Deleting company", employees + departments)
+    frappe.delete_doc("Company", company, ignore_permissions=True)
+
+    invalidate(*{group for groups in INVALIDATES.values() for group in groups})
+    if commit:
+        frappe.db.commit()
+    progress(100, "Done", employees + departments + 1)
+
+    return {"company": company, "employees": employees, "departments": departments}
+
+
+def delete_department(department, progress=None, commit=True):
+    """Delete a department; its on_trash hook removes the employees set-based."""
+    progress = progress or no_progress
+    progress(10, "Deleting employees")
+    employees = frappe.db.count("Employee", {"department": department})
+    frappe.delete_doc("Department", department, ignore_permissions=True)
+    if commit:
+        frappe.db.commit()
+    progress(100, "Done", employees + 1)
+    return {"department": department, "employees": employees}
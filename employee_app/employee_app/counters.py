@@ -0,0 +1,95 @@
+# Copyright (c) 2025, Mostafa K. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.utils import now
+
+from employee_app.employee_app.cache import INVALIDATES, invalidate
+from employee_app.employee_app.utils import affected_rows
+
+# (doctype, fieldname) pairs maintained by this module
+COUNTER_FIELDS = {
+    ("Company", "number_of_employees"),
+    ("Company", "number_of_departments"),
+    ("Department", "number_of_employees"),
+}
+
+
+def apply_delta(doctype, name, fieldname, delta, update_modified=True):
+    """Atomically add `delta` to a counter field without reading it first.
+
+    The update happens in the database (`field = field + delta`), so two
+    concurrent hires can never overwrite each other's count.
+    """
+    if not name or not delta:
+        return
+
+    if (doctype, fieldname) not in COUNTER_FIELDS:
+        frappe.throw(f"{doctype}.{fieldname} is not a maintained counter.")
+
+    modified = ", `modified` = %(modified)s" if update_modified else ""
+    frappe.db.sql(
+        f"""
+        UPDATE `tab{doctype}`
+        SET `{fieldname}` = GREATEST(COALESCE(`{fieldname}`, 0) + %(delta)s, 0){modified}
+        WHERE `name` = %(name)s
+        """,
+        {"delta": delta, "name": name, "modified": now()},
+    )
+
+
+def move(doctype, fieldname, old_name, new_name, count=1):
+    """Move `count` units of a counter from one parent record to another."""
+    if old_name == new_name:
+        return
+
+    apply_delta(doctype, old_name, fieldname, -count)
+    apply_delta(doctype, new_name, fieldname, count)
+
+
+def reconcile_counters(progress=None):
+    """Rebuild every counter from the source tables.
+
+    Each parent table is refreshed by a single UPDATE joined against a
+    grouped COUNT, so the cost is one scan of Employee and Department
+    regardless of how many companies or departments exist. Returns the
+    number of rows whose counters changed.
+    """
+    if progress:
+        progress(10, "Reconciling department counters")
+    frappe.db.sql(
+        """
+        UPDATE `tabDepartment` d
+        LEFT JOIN (
+            SELECT `department`, COUNT(*) AS cnt
+            FROM `tabEmployee`
+            GROUP BY `department`
+        ) e ON e.`department` = d.`name`
+        SET d.`number_of_employees` = COALESCE(e.cnt, 0)
+        """
+    )
+    departments = affected_rows()
+
+    if progress:
+        progress(50, "Reconciling company counters", departments)
+    frappe.db.sql(
+        """
+        UPDATE `tabCompany` c
+        LEFT JOIN (
+            SELECT `company`, COUNT(*) AS cnt
+            FROM `tabEmployee`
+            GROUP BY `company`
+        ) e ON e.`company` = c.`name`
+        LEFT JOIN (
+            SELECT `company`, COUNT(*) AS cnt
+            FROM `tabDepartment`
+            GROUP BY `company`
+        ) d ON d.`company` = c.`name`
+        SET c.`number_of_employees` = COALESCE(e.cnt, 0),
+            c.`number_of_departments` = COALESCE(d.cnt, 0)
+        """
+    )
+    companies = affected_rows()
+
+    invalidate(*INVALIDATES["Company"])
+    return {"departments": departments, "companies": companies}
@@ -0,0 +1,58 @@
+# Copyright (c) 2025, Mostafa K. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.utils import add_months, cint, get_first_day, today
+
+from employee_app.employee_app import statistics
+from employee_app.employee_app.api.company import COMPANY_READ_FIELDS
+from employee_app.employee_app.api.employee import get_recently_hired_employees
+from employee_app.employee_app.pagination import paginate
+
+DEFAULT_COMPANIES_LIMIT = 10
+DEFAULT_HIRES_MONTHS = 12
+MAX_HIRES_MONTHS = 60
+
+
+def get_totals():
+    """Company and department totals in a single statement."""
+    return frappe.db.sql(
+        """
+        SELECT
+            (SELECT COUNT(*) FROM `tabCompany`) AS companies,
+            (SELECT COUNT(*) FROM `tabDepartment`) AS departments
+        """,
+        as_dict=True,
+    )[0]
+
+
+def get_hires_by_month(months=DEFAULT_HIRES_MONTHS):
+    """Hired employees per month for the last `months` months, oldest first."""
+    months = max(1, min(cint(months) or DEFAULT_HIRES_MONTHS, MAX_HIRES_MONTHS))
+    since = add_months(get_first_day(today()), -(months - 1))
+    hires = statistics.get_hires_by_month(since)
+    return [{"month": month, "count": count} for month, count in hires.items()]
+
+
+def get_dashboard_data(companies_limit=None, companies_cursor=None, hires_months=None):
+    """Every dashboard widget in a fixed number of queries, whatever the tenant size."""
+    totals = get_totals()
+    summary = statistics.get_summary()
+    companies = paginate(
+        "Company",
+        fields=COMPANY_READ_FIELDS,
+        cursor=companies_cursor,
+        page_size=companies_limit or DEFAULT_COMPANIES_LIMIT,
+    )
+
+    return {
+        "companies": companies["items"],
+        "companies_next_cursor": companies["next_cursor"],
+        "companies_count": totals.companies,
+        "recent_employees": get_recently_hired_employees(),
+        "employees_count": summary["total_employees"],
+        "department_count": totals.departments,
+        "employees_by_status": summary["by_status"],
+        "average_days_employed": summary["average_days_employed"],
+        "hires_by_month": get_hires_by_month(hires_months or DEFAULT_HIRES_MONTHS),
+    }
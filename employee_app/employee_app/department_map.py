@@ -0,0 +1,114 @@
+# Copyright (c) 2025, Mostafa K. and contributors
+# For license information, please see license.txt
+
+"""Department -> company lookups without a query per validated employee.
+
+The full map is kept in three places:
+
+* process memory, per site, reused for as long as that site's Redis version
+  token is unchanged (the token is read once per request or job);
+* Redis, under a key that embeds the version, shared by every worker;
+* per-transaction overrides for departments written in the current
+  transaction, so validation sees its own uncommitted changes.
+
+Department hooks record an override immediately and bump the version once
+the transaction commits.
+"""
+
+import frappe
+
+from employee_app.employee_app.cache import CACHE_PREFIX
+
+VERSION_KEY = f"{CACHE_PREFIX}:department_company:version"
+MAP_TTL = 24 * 60 * 60
+
+# site -> (version, mapping); a worker process serves every site on the bench
+_process = {}
+
+
+def _map_key(version):
+    return f"{CACHE_PREFIX}:department_company:{version}"
+
+
+def _get_overrides():
+    overrides = getattr(frappe.local, "employee_app_department_overrides", None)
+    if overrides is None:
+        overrides = frappe.local.employee_app_department_overrides = {}
+    return overrides
+
+
+def _get_version():
+    version = getattr(frappe.local, "employee_app_department_version", None)
+    if version is None:
+        version = frappe.cache.get_value(VERSION_KEY) or "0"
+        frappe.local.employee_app_department_version = version
+    return version
+
+
+def _load():
+    return dict(frappe.get_all("Department", fields=["name", "company"], as_list=True, limit=0))
+
+
+def get_department_companies():
+    """department -> company for every committed department."""
+    version = _get_version()
+    cached_version, mapping = _process.get(frappe.local.site, (None, None))
+    if cached_version == version:
+        return mapping
+
+    mapping = frappe.cache.get_value(_map_key(version))
+    if mapping is None:
+        mapping = _load()
+        if _get_overrides():
+            # the load saw this transaction's uncommitted departments; don't share it
+            return mapping
+        frappe.cache.set_value(_map_key(version), mapping, expires_in_sec=MAP_TTL)
+
+    _process[frappe.local.site] = (version, mapping)
+    return mapping
+
+
+def get_department_company(department):
+    """Company of `department`, or None if it does not exist."""
+    if not department:
+        return None
+
+    overrides = _get_overrides()
+    if department in overrides:
+        return overrides[department]
+
+    mapping = get_department_companies()
+    if department in mapping:
+        return mapping[department]
+
+    # created after the map was built; the version bump on commit picks it up
+    return frappe.db.get_value("Department", department, "company")
+
+
+def get_companies_for(departments):
+    """department -> company for `departments`, skipping ones that do not exist."""
+    result = {}
+    for department in set(departments):
+        company = get_department_company(department)
+        if company:
+            result[department] = company
+    return result
+
+
+def invalidate():
+    """Start a new map version once the current transaction commits."""
+
+    def _bump():
+        frappe.cache.set_value(VERSION_KEY, frappe.generate_hash(length=10))
+        _process.pop(frappe.local.site, None)
+        frappe.local.employee_app_department_version = None
+        _get_overrides().clear()
+
+    frappe.db.after_commit.add(_bump)
+    frappe.db.after_rollback.add(_get_overrides().clear)
+
+
+def remember(department, company):
+    """Record an uncommitted department write (company=None for a delete)."""
+    _get_overrides()[department] = company
+    invalidate()
@@ -8,5 +8,9 @@ from frappe.model.document import Document
 class Company(Document):
 	pass
 
-	
- 
\ No newline at end of file
+
+def on_doctype_update():
+	# fresh installs skip patches; the list and sync walks need these indexes
+	from employee_app.employee_app.indexes import ensure_indexes
+
+	ensure_indexes(["Company"])
@@ -1,9 +1,189 @@
 # Copyright (c) 2025, Mostafa K. and Contributors
 # See license.txt
 
-# import frappe
+from unittest.mock import patch
+
+import frappe
 from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days
+from werkzeug.test import EnvironBuilder
+from werkzeug.wrappers import Request, Response
+
+from employee_app.employee_app import responses
+from employee_app.employee_app.api.company import (
+	delete_company,
+	get_company,
+	get_company_related_employee,
+	list_companies,
+)
+from employee_app.employee_app.api.department import delete_department
+from employee_app.employee_app.cascade import delete_company_cascade
+from employee_app.employee_app.doctype.employee.test_employee import (
+	make_company,
+	make_department,
+	make_employee,
+)
+from employee_app.employee_app.jobs import get_job, run_job, submit_job, update_job
+from employee_app.employee_app.pagination import paginate
+
+
+def conditional_get(endpoint, headers=None, **kwargs):
+	"""Call `endpoint` as a GET with `headers`; returns (status code, validators set)."""
+	previous = getattr(frappe.local, "request", None)
+	frappe.local.request = Request(EnvironBuilder(method="GET", headers=headers or {}).get_environ())
+	setattr(frappe.local, responses._HEADERS, None)
+	frappe.local.response.pop("http_status_code", None)
+	try:
+		endpoint(**kwargs)
+	finally:
+		frappe.local.request = previous
+	return frappe.local.response.get("http_status_code"), getattr(frappe.local, responses._HEADERS)
+
+
+def failing_job(progress=None):
+	progress(50, "About to fail")
+	raise frappe.ValidationError("Job failed on purpose")
 
 
 class TestCompany(FrappeTestCase):
-	pass
+	def tearDown(self):
+		frappe.db.rollback()
+		frappe.local.response.pop("http_status_code", None)
+		setattr(frappe.local, responses._HEADERS, None)
+
+	def test_keyset_pagination_visits_every_row_once(self):
+		created = {
+			frappe.get_doc({"doctype": "Company", "company_name": f"_Test Page Co {i}"}).insert().name
+			for i in range(5)
+		}
+		filters = [["Company", "company_name", "like", "_Test Page Co %"]]
+
+		seen, cursor = [], None
+		while True:
+			page = paginate("Company", ["name"], filters=filters, cursor=cursor, page_size=2)
+			self.assertLessEqual(len(page["items"]), 2)
+			seen.extend(row.name for row in page["items"])
+			cursor = page["next_cursor"]
+			if not page["has_more"]:
+				break
+
+		self.assertEqual(len(seen), len(set(seen)))
+		self.assertEqual(set(seen), created)
+
+	def test_cascade_delete_removes_dependents(self):
+		company = make_company("_Test Cascade Co").name
+		department = make_department("Ops", company).name
+		for i in range(3):
+			make_employee(f"Cascade {i}", department, company)
+
+		result = delete_company_cascade(company, commit=False)
+
+		self.assertEqual(result["employees"], 3)
+		self.assertEqual(result["departments"], 1)
+		self.assertFalse(frappe.db.exists("Company", company))
+		self.assertFalse(frappe.db.exists("Department", department))
+		self.assertFalse(frappe.db.exists("Employee", {"company": company}))
+
+	def test_delete_endpoints_queue_a_job(self):
+		company = make_company("_Test Job Co").name
+		department = make_department("Jobs", company).name
+
+		for response in (delete_department(name=department), delete_company(name=company)):
+			self.assertEqual(frappe.local.response["http_status_code"], 202)
+			job = get_job(response["job_id"])
+			self.assertEqual((job["status"], job["operation"]), ("queued", "delete"))
+			self.assertEqual(job["user"], frappe.session.user)
+
+		# nothing runs until the request commits
+		self.assertTrue(frappe.db.exists("Company", company))
+
+	def test_submit_job_enqueues_run_job_with_the_engine(self):
+		# autospec keeps frappe.enqueue's signature, so a clash with its `method` argument fails here
+		with patch("frappe.enqueue", autospec=True) as enqueue:
+			job_id = submit_job("delete", "employee_app.employee_app.cascade.delete_department", department="X")
+
+		args, kwargs = enqueue.call_args
+		self.assertEqual(args, ("employee_app.employee_app.jobs.run_job",))
+		self.assertEqual(kwargs["tracking_id"], job_id)
+		self.assertEqual(kwargs["engine"], "employee_app.employee_app.cascade.delete_department")
+		self.assertEqual(kwargs["kwargs"], {"department": "X"})
+
+	def test_run_job_records_progress_and_result(self):
+		company = make_company("_Test Run Job Co").name
+		department = make_department("Run", company).name
+		make_employee("Run Job One", department, company)
+
+		update_job("_test_run_job", status="queued", user=frappe.session.user)
+		result = run_job(
+			"_test_run_job",
+			"employee_app.employee_app.cascade.delete_company_cascade",
+			{"company": company, "commit": False},
+		)
+
+		job = get_job("_test_run_job")
+		self.assertEqual((job["status"], job["progress"]), ("finished", 100))
+		self.assertEqual(job["result"], result)
+		self.assertEqual(job["rows_processed"], sum(v for v in result.values() if isinstance(v, int)))
+		self.assertFalse(frappe.db.exists("Company", company))
+
+	def test_run_job_records_failure(self):
+		update_job("_test_failed_job", status="queued", user=frappe.session.user)
+		with self.assertRaises(frappe.ValidationError):
+			run_job(
+				"_test_failed_job",
+				"employee_app.employee_app.doctype.company.test_company.failing_job",
+				{},
+			)
+
+		job = get_job("_test_failed_job")
+		self.assertEqual(job["status"], "failed")
+		self.assertEqual(job["stage"], "About to fail")
+		self.assertEqual(job["errors"], ["Job failed on purpose"])
+		self.assertTrue(job["finished_at"])
+
+	def test_conditional_get_etag(self):
+		company = make_company("_Test ETag Co")
+
+		status, headers = conditional_get(get_company, name=company.name)
+		self.assertNotEqual(status, 304)
+		self.assertEqual(headers["Cache-Control"], responses.DEFAULT_CACHE_CONTROL)
+		etag = headers["ETag"]
+
+		status, _headers = conditional_get(get_company, {"If-None-Match": etag}, name=company.name)
+		self.assertEqual(status, 304)
+		response = Response(b"payload", status=304)
+		responses.after_request(response, frappe.local.request)
+		self.assertEqual((response.headers["ETag"], response.get_data()), (etag, b""))
+
+		# a change, or another representation, gets a new tag
+		status, _headers = conditional_get(
+			get_company, {"If-None-Match": etag}, name=company.name, include="departments"
+		)
+		self.assertNotEqual(status, 304)
+		frappe.db.set_value(
+			"Company", company.name, "modified", add_days(company.modified, 1), update_modified=False
+		)
+		status, _headers = conditional_get(get_company, {"If-None-Match": etag}, name=company.name)
+		self.assertNotEqual(status, 304)
+
+	def test_conditional_get_if_modified_since(self):
+		company = make_company("_Test IMS Co").name
+		later = {"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"}
+
+		# honoured for a single record by name
+		status, _headers = conditional_get(get_company, later, name=company, include="")
+		self.assertEqual(status, 304)
+		# a set can shrink without MAX(modified) moving, so collections ignore it
+		status, _headers = conditional_get(list_companies, later)
+		self.assertNotEqual(status, 304)
+
+	def test_employee_etag_changes_with_the_date(self):
+		company = make_company("_Test Calendar Co").name
+		make_employee("Calendar One", make_department("Calendar", company).name, company)
+
+		_status, headers = conditional_get(get_company_related_employee, company=company)
+		with patch.object(responses, "today", return_value="2100-01-01"):
+			status, _headers = conditional_get(
+				get_company_related_employee, {"If-None-Match": headers["ETag"]}, company=company
+			)
+		self.assertNotEqual(status, 304)
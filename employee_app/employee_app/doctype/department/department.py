@@ -4,44 +4,68 @@
 import frappe
 from frappe.model.document import Document
 
+from employee_app.employee_app import cascade, counters, department_map, statistics, transfer
+from employee_app.employee_app.profiler import profiled
+
 class Department(Document):
     # --- Lifecycle Hooks ---
+    @profiled(label="Department.after_insert")
     def after_insert(self):
         """Triggered after a new department is inserted."""
-        self._update_company_department_count()
+        self._update_company_department_count(1)
+        statistics.ensure_department(self.company, self.name)
 
+    @profiled(label="Department.on_update")
     def on_update(self):
         """Triggered after department is updated."""
-        self._update_company_department_count()
+        self._move_company_department_count()
+        department_map.remember(self.name, self.company)
  
+    @profiled(label="Department.on_trash")
     def on_trash(self):
         """Triggered before department is deleted."""
         self._handle_related_records_before_delete()
+        self._update_company_department_count(-1)
+        department_map.remember(self.name, None)
+
+    def after_rename(self, old, new, merge=False):
+        """Triggered after the department is renamed."""
+        department_map.remember(old, None)
+        department_map.remember(new, self.company)
 
 
 
     # --- Business Logic ---
-    def _update_company_department_count(self):
-        """Recalculate the number of departments for the linked company."""
+    def _update_company_department_count(self, delta):
+        """Apply a +1/-1 delta to number_of_departments on the linked company."""
         if not self.company:
             frappe.throw("Department must be linked to a company.")
 
         try:
-            department_count = frappe.db.count("Department", {"company": self.company})
-            frappe.db.set_value("Company", self.company, "number_of_departments", department_count)
+            counters.apply_delta("Company", self.company, "number_of_departments", delta)
         except Exception as e:
             frappe.log_error(message=str(e), title="Department Count Update Failed")
             frappe.throw(f"Could not update department count for company: {self.company}")
 
+    def _move_company_department_count(self):
+        """Shift the department count when a department moves to another company."""
+        previous = self.get_doc_before_save()
+        if not previous:
+            # new document, counted in after_insert
+            return
+
+        counters.move("Company", "number_of_departments", previous.company, self.company)
+        if previous.company != self.company:
+            # keep the department/company alignment of the employees
+            transfer.realign_department_employees(self.name, self.company)
+
     def _handle_related_records_before_delete(self):
         """ Handle cascading deletions by delete related employees before department deletion. """
-        related_employees = frappe.get_all(
-            "Employee", filters={"department": self.name}, fields=["name"]
-        )
-
-        if related_employees:
-            # cascade delete
-            
-            for emp in related_employees:
-                frappe.delete_doc("Employee", emp.name, ignore_permissions=True)
-            frappe.db.commit()
+        cascade.delete_department_employees(self.name)
+
+
+def on_doctype_update():
+    # fresh installs skip patches; the list and sync walks need these indexes
+    from employee_app.employee_app.indexes import ensure_indexes
+
+    ensure_indexes(["Department"])
@@ -1,9 +1,118 @@
 # Copyright (c) 2025, Mostafa K. and Contributors
 # See license.txt
 
-# import frappe
+import frappe
 from frappe.tests.utils import FrappeTestCase
 
+from employee_app.employee_app import department_map
+from employee_app.employee_app.batch import fetch_by_names, fetch_related, parse_names
+from employee_app.employee_app.doctype.employee.test_employee import (
+	make_company,
+	make_department,
+	make_employee,
+	make_restricted_user,
+)
+
 
 class TestDepartment(FrappeTestCase):
-	pass
+	def tearDown(self):
+		frappe.db.rollback()
+
+	def test_delete_cascades_to_employees_and_counters(self):
+		company = make_company("_Test Department Co").name
+		department = make_department("Finance", company).name
+		make_employee("Department One", department, company)
+		make_employee("Department Two", department, company)
+		self.assertEqual(frappe.db.get_value("Company", company, "number_of_departments"), 1)
+
+		frappe.delete_doc("Department", department)
+
+		self.assertFalse(frappe.db.exists("Employee", {"department": department}))
+		self.assertEqual(frappe.db.get_value("Company", company, "number_of_employees"), 0)
+		self.assertEqual(frappe.db.get_value("Company", company, "number_of_departments"), 0)
+
+	def test_company_lookup_follows_uncommitted_changes(self):
+		first = make_company("_Test Lookup Co A").name
+		second = make_company("_Test Lookup Co B").name
+		department = make_department("Logistics", first)
+		self.assertEqual(department_map.get_department_company(department.name), first)
+
+		department.company = second
+		department.save()
+		self.assertEqual(department_map.get_department_company(department.name), second)
+
+		department.delete()
+		self.assertIsNone(department_map.get_department_company(department.name))
+
+	def test_process_map_is_per_site(self):
+		# another site on the same bench, cached in this worker process at the same version
+		department_map._process["_other.site"] = (department_map._get_version(), {"_Other Dept": "_Other Co"})
+		department_map._process.pop(frappe.local.site, None)
+		try:
+			self.assertNotIn("_Other Dept", department_map.get_department_companies())
+		finally:
+			department_map._process.pop("_other.site", None)
+
+	def test_company_change_realigns_employees(self):
+		first = make_company("_Test Move Co A").name
+		second = make_company("_Test Move Co B").name
+		department = make_department("Operations", first)
+		employee = make_employee("Move One", department.name, first)
+
+		department.company = second
+		department.save()
+
+		self.assertEqual(frappe.db.get_value("Employee", employee.name, "company"), second)
+		self.assertEqual(frappe.db.get_value("Company", first, "number_of_employees"), 0)
+		self.assertEqual(frappe.db.get_value("Company", second, "number_of_employees"), 1)
+		self.assertEqual(frappe.db.get_value("Company", second, "number_of_departments"), 1)
+
+	def test_parse_names_and_fetch_by_names(self):
+		self.assertEqual(parse_names('["b", "a", "b"]'), ["b", "a"])
+		self.assertEqual(parse_names("a, b,,a"), ["a", "b"])
+		self.assertRaises(frappe.ValidationError, parse_names, "")
+		self.assertRaises(frappe.ValidationError, parse_names, ["a", "b", "c"], limit=2)
+
+		company = make_company("_Test Batch Co").name
+		department = make_department("Batch", company).name
+		found = fetch_by_names("Department", ["name", "company"], [department, "_Missing Dept"])
+		self.assertEqual(list(found), [department])
+		self.assertEqual(found[department].company, company)
+
+	def test_fetch_related_caps_each_parent(self):
+		company = make_company("_Test Related Co").name
+		busy = make_department("Busy", company).name
+		quiet = make_department("Quiet", company).name
+		empty = make_department("Empty", company).name
+		busy_names = [make_employee(f"Busy {i}", busy, company).name for i in range(3)]
+		quiet_name = make_employee("Quiet 0", quiet, company).name
+
+		related, has_more = fetch_related("Employee", ["name"], "department", [busy, quiet, empty], 2)
+
+		# newest first, at most two per department
+		self.assertEqual([row.name for row in related[busy]], busy_names[:0:-1])
+		self.assertEqual([row.name for row in related[quiet]], [quiet_name])
+		self.assertEqual(related[empty], [])
+		self.assertEqual(has_more, {busy: True, quiet: False, empty: False})
+
+		related, has_more = fetch_related("Employee", ["name"], "department", [busy])
+		self.assertEqual([row.name for row in related[busy]], busy_names[::-1])
+		self.assertFalse(has_more[busy])
+
+	def test_fetch_helpers_apply_user_permissions(self):
+		allowed = make_company("_Test Allowed Co").name
+		hidden = make_company("_Test Hidden Co").name
+		departments = [make_department("Perm", company).name for company in (allowed, hidden)]
+		for department, company in zip(departments, (allowed, hidden), strict=True):
+			make_employee(f"Perm {company}", department, company)
+
+		frappe.set_user(make_restricted_user(allowed))
+		try:
+			parents = fetch_by_names("Department", ["name"], departments)
+			related, _has_more = fetch_related("Employee", ["name"], "department", departments, 10)
+		finally:
+			frappe.set_user("Administrator")
+
+		self.assertEqual(list(parents), departments[:1])
+		self.assertEqual(len(related[departments[0]]), 1)
+		self.assertEqual(related[departments[1]], [])
@@ -5,11 +5,15 @@ import frappe
 from frappe.model.document import Document
 from frappe.utils import today, getdate
 
+from employee_app.employee_app import counters, department_map, statistics
+from employee_app.employee_app.profiler import profiled
+
 class Employee(Document):
+    @profiled(label="Employee.validate")
     def validate(self):
         # Ensure department-company alignment.
         if self.department:
-            dept_company = frappe.db.get_value("Department", self.department, "company")
+            dept_company = department_map.get_department_company(self.department)
             if dept_company and dept_company != self.company:
                 frappe.log_error(
                     f"Department {self.department} belongs to company {dept_company}, not {self.company}.",
@@ -22,20 +26,24 @@ class Employee(Document):
 
                 return
     
-    def on_update(self):
+    @profiled(label="Employee.before_save")
+    def before_save(self):
         self.auto_set_hired_on_date()
+
+    @profiled(label="Employee.on_update")
+    def on_update(self):
+        self.move_employee_count()
         
+    @profiled(label="Employee.after_insert")
     def after_insert(self):
-        self.update_employee_count()
-
-    def on_save(self):
-        self.update_employee_count()
+        self.update_employee_count(1)
 
+    @profiled(label="Employee.on_trash")
     def on_trash(self):
-        self.update_employee_count()
+        self.update_employee_count(-1)
       
-    def update_employee_count(self):
-        """Update number_of_employees for related Department and Company."""
+    def update_employee_count(self, delta):
+        """Apply a +1/-1 delta to number_of_employees on the Department and Company."""
 		
         if not self.department:
             frappe.throw("Employee must be linked to a department to update employee count.")
@@ -44,24 +52,38 @@ class Employee(Document):
             frappe.throw("Employee must be linked to a company to update employee count.")
 
         try:
-            # Count employees in department and company
-            employees_in_department_count = frappe.db.count("Employee", {"department": self.department})
-            employees_in_company_count = frappe.db.count("Employee", {"company": self.company})
-
-            # Update both records
-            frappe.db.set_value("Department", self.department, "number_of_employees", employees_in_department_count)
-            frappe.db.set_value("Company", self.company, "number_of_employees", employees_in_company_count)
-            frappe.db.commit()
+            counters.apply_delta("Department", self.department, "number_of_employees", delta)
+            counters.apply_delta("Company", self.company, "number_of_employees", delta)
+            statistics.record_employee_change(self, sign=delta)
 
         except Exception:
             frappe.throw( f"Failed to update employee count for department {self.department} and company {self.company}")
 
+    def move_employee_count(self):
+        """Shift the counts when an existing employee changes department or company."""
+        previous = self.get_doc_before_save()
+        if not previous:
+            # new document, counted in after_insert
+            return
+
+        counters.move("Department", "number_of_employees", previous.department, self.department)
+        counters.move("Company", "number_of_employees", previous.company, self.company)
+        self.update_statistics(previous)
+
+    def update_statistics(self, previous):
+        """Move the employee between statistics buckets if anything they are grouped by changed."""
+        tracked = ("company", "department", "workflow_state", "hired_on")
+        if any(str(previous.get(field) or "") != str(self.get(field) or "") for field in tracked):
+            statistics.record_employee_change(self, previous)
 
-    
     def auto_set_hired_on_date(self):
+        """Stamp hired_on in the same write that moves the employee to Hired."""
         if self.workflow_state == "Hired" and  not self.hired_on:
-            frappe.db.set_value("Employee",self.name,"hired_on",today())
-            frappe.db.commit()
-            self.reload()
-        
-            
+            self.hired_on = today()
+
+
+def on_doctype_update():
+    # fresh installs skip patches; search_employees needs the FULLTEXT index to exist
+    from employee_app.employee_app.indexes import ensure_indexes
+
+    ensure_indexes(["Employee"])
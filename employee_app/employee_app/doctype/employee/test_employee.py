@@ -1,9 +1,402 @@
 # Copyright (c) 2025, Mostafa K. and Contributors
 # See license.txt
 
-# import frappe
+import csv
+import gzip
+import io
+import json
+from unittest.mock import patch
+
+import frappe
 from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, today
+
+from employee_app.employee_app.api.employee import (
+	get_employee_read_fields,
+	get_employee_record,
+	get_recent_hires,
+	get_recently_hired_employees,
+)
+from employee_app.employee_app.api.employee import transfer_employees as transfer_employees_endpoint
+from employee_app.employee_app.counters import reconcile_counters
+from employee_app.employee_app.export import iter_chunks, iter_export
+from employee_app.employee_app.indexes import get_api_queries
+from employee_app.employee_app.pagination import paginate
+from employee_app.employee_app.projection import get_related_limit, parse_include, select_fields
+from employee_app.employee_app.search import build_match_query, search_employees
+from employee_app.employee_app.tenure import DAYS_EMPLOYED_EXPRESSION, refresh_days_employed
+from employee_app.employee_app.transfer import transfer_employees
+from employee_app.employee_app.transitions import transition_employees
+
+
+def make_company(company_name):
+	if frappe.db.exists("Company", company_name):
+		return frappe.get_doc("Company", company_name)
+	return frappe.get_doc({"doctype": "Company", "company_name": company_name}).insert()
+
+
+def make_department(department_name, company):
+	return frappe.get_doc(
+		{"doctype": "Department", "department_name": department_name, "company": company}
+	).insert()
+
+
+def make_employee(employee_name, department, company):
+	return frappe.get_doc(
+		{
+			"doctype": "Employee",
+			"employee_name": employee_name,
+			"email_address": f"{employee_name.lower().replace(' ', '.')}@example.com",
+			"mobile_number": "+201000000000",
+			"address": "Cairo",
+			"designation_positiontitle": "Engineer",
+			"department": department,
+			"company": company,
+		}
+	).insert()
+
+
+def make_restricted_user(company, email="employee-app-restricted@example.com"):
+	"""A System Manager limited to `company` through a User Permission."""
+	if not frappe.db.exists("User", email):
+		user = frappe.get_doc(
+			{"doctype": "User", "email": email, "first_name": "Restricted", "send_welcome_email": 0}
+		).insert(ignore_permissions=True)
+		user.add_roles("System Manager")
+	frappe.get_doc(
+		{"doctype": "User Permission", "user": email, "allow": "Company", "for_value": company}
+	).insert(ignore_permissions=True)
+	return email
+
+
+def make_employee_workflow():
+	"""An active Employee workflow where "Hire" hires engineers and turns down everyone else."""
+	for state in ("Application Received", "Hired", "Not Accepted"):
+		if not frappe.db.exists("Workflow State", state):
+			frappe.get_doc({"doctype": "Workflow State", "workflow_state_name": state}).insert()
+	if not frappe.db.exists("Workflow Action Master", "Hire"):
+		frappe.get_doc({"doctype": "Workflow Action Master", "workflow_action_name": "Hire"}).insert()
+
+	workflow = frappe.new_doc("Workflow")
+	workflow.workflow_name = "_Test Employee Workflow"
+	workflow.document_type = "Employee"
+	workflow.workflow_state_field = "workflow_state"
+	workflow.is_active = 1
+	workflow.send_email_alert = 0
+	for state, update_value in (("Application Received", None), ("Hired", "Hired"), ("Not Accepted", None)):
+		workflow.append(
+			"states",
+			{
+				"state": state,
+				"allow_edit": "System Manager",
+				"update_field": "status" if update_value else None,
+				"update_value": update_value,
+			},
+		)
+	for next_state, condition in (
+		("Hired", "doc.designation_positiontitle.startswith('Eng')"),
+		("Not Accepted", "not doc.designation_positiontitle.startswith('Eng')"),
+	):
+		workflow.append(
+			"transitions",
+			{
+				"state": "Application Received",
+				"action": "Hire",
+				"next_state": next_state,
+				"allowed": "System Manager",
+				"allow_self_approval": 1,
+				"condition": condition,
+			},
+		)
+	return workflow.insert(ignore_permissions=True)
+
+
+def get_count(doctype, name, fieldname="number_of_employees"):
+	return frappe.db.get_value(doctype, name, fieldname)
 
 
 class TestEmployee(FrappeTestCase):
-	pass
+	def setUp(self):
+		self.company = make_company("_Test Counter Co").name
+		self.other_company = make_company("_Test Counter Co 2").name
+		self.department = make_department("Sales", self.company).name
+		self.other_department = make_department("Support", self.company).name
+
+	def tearDown(self):
+		frappe.db.rollback()
+
+	def test_counters_follow_insert_and_trash(self):
+		employee = make_employee("Counter One", self.department, self.company)
+		self.assertEqual(get_count("Department", self.department), 1)
+		self.assertEqual(get_count("Company", self.company), 1)
+
+		frappe.delete_doc("Employee", employee.name)
+		self.assertEqual(get_count("Department", self.department), 0)
+		self.assertEqual(get_count("Company", self.company), 0)
+
+	def test_counters_follow_department_move(self):
+		employee = make_employee("Counter Two", self.department, self.company)
+		employee.department = self.other_department
+		employee.save()
+
+		self.assertEqual(get_count("Department", self.department), 0)
+		self.assertEqual(get_count("Department", self.other_department), 1)
+		self.assertEqual(get_count("Company", self.company), 1)
+
+	def test_reconcile_repairs_drift(self):
+		make_employee("Counter Three", self.department, self.company)
+		frappe.db.set_value("Department", self.department, "number_of_employees", 42)
+		frappe.db.set_value("Company", self.other_company, "number_of_departments", 7)
+
+		reconcile_counters()
+
+		self.assertEqual(get_count("Department", self.department), 1)
+		self.assertEqual(get_count("Company", self.company), 1)
+		self.assertEqual(get_count("Company", self.company, "number_of_departments"), 2)
+		self.assertEqual(get_count("Company", self.other_company, "number_of_departments"), 0)
+
+	def test_refresh_days_employed_matches_computed_mode(self):
+		hired = make_employee("Tenure Hired", self.department, self.company)
+		applicant = make_employee("Tenure Applicant", self.department, self.company)
+		for name, state in ((hired.name, "Hired"), (applicant.name, "Application Received")):
+			frappe.db.set_value(
+				"Employee", name, {"workflow_state": state, "hired_on": add_days(today(), -10)}
+			)
+
+		for chunk_size in (None, 1):
+			frappe.db.set_value("Employee", hired.name, "days_employed", 0)
+			# left over from an earlier spell as Hired
+			frappe.db.set_value("Employee", applicant.name, "days_employed", 99)
+			stats = refresh_days_employed(chunk_size=chunk_size, commit=False)
+			self.assertGreaterEqual(stats["rows"], 2)
+			self.assertEqual(frappe.db.get_value("Employee", hired.name, "days_employed"), 10)
+			self.assertEqual(frappe.db.get_value("Employee", applicant.name, "days_employed"), 0)
+
+		computed = frappe.db.sql(
+			f"SELECT `name`, {DAYS_EMPLOYED_EXPRESSION} FROM `tabEmployee` WHERE `name` IN %(names)s",
+			{"names": [hired.name, applicant.name]},
+		)
+		for name, days in computed:
+			self.assertEqual(frappe.db.get_value("Employee", name, "days_employed"), days)
+
+	def test_computed_days_employed_in_get_all_reads(self):
+		hired = make_employee("Computed Hired", self.department, self.company)
+		applicant = make_employee("Computed Applicant", self.department, self.company)
+		frappe.db.set_value(
+			"Employee", hired.name, {"workflow_state": "Hired", "hired_on": add_days(today(), -10)}
+		)
+		frappe.db.set_value("Employee", applicant.name, {"workflow_state": "Application Received", "hired_on": None})
+		expected = {hired.name: 10, applicant.name: 0}
+
+		with patch.dict(frappe.local.conf, {"employee_app_days_employed_mode": "computed"}):
+			self.assertEqual(get_employee_record(hired.name).days_employed, 10)
+			page = paginate(
+				"Employee",
+				get_employee_read_fields(),
+				filters=[["Employee", "name", "in", list(expected)]],
+			)
+
+		self.assertEqual({row.name: row.days_employed for row in page["items"]}, expected)
+
+	def test_every_api_query_can_be_explained(self):
+		queries = get_api_queries()
+		for label in ("search_employees", "export_employees?chunk", "get_changes?Employee", "fetch_related?company"):
+			self.assertIn(label, queries)
+		for label, query in queries.items():
+			with self.subTest(label):
+				self.assertTrue(frappe.db.sql(f"EXPLAIN {query}"))
+
+	def test_search_query_and_short_prefix_fallback(self):
+		self.assertEqual(build_match_query("jo smith@exa"), "+smith* +exa*")
+		self.assertIsNone(build_match_query("jo +"))
+
+		# FULLTEXT only sees committed rows, so exercise the prefix fallback here
+		make_employee("Zq Search", self.department, self.company)
+		results = search_employees("Zq", fields=["name", "employee_name"], company=self.company)
+		self.assertEqual([row.employee_name for row in results], ["Zq Search"])
+		self.assertEqual(search_employees("Zq", fields=["name"], company=self.other_company), [])
+
+		other_department = make_department("Search Elsewhere", self.other_company).name
+		make_employee("Zq Hidden", other_department, self.other_company)
+		frappe.set_user(make_restricted_user(self.company))
+		try:
+			results = search_employees("Zq", fields=["name", "employee_name"])
+		finally:
+			frappe.set_user("Administrator")
+		self.assertEqual([row.employee_name for row in results], ["Zq Search"])
+
+	def test_recent_hires_window_and_order(self):
+		rows = (("Recent Old", "Hired", -40), ("Recent New", "Hired", -2), ("Recent Mid", "Hired", -5))
+		rows += (("Recent Applicant", "Application Received", -1),)
+		for employee_name, state, offset in rows:
+			employee = make_employee(employee_name, self.department, self.company)
+			frappe.db.set_value(
+				"Employee", employee.name, {"workflow_state": state, "hired_on": add_days(today(), offset)}
+			)
+
+		hires = get_recent_hires(add_days(today(), -30), company=self.company, limit=10)
+		self.assertEqual([row.employee_name for row in hires], ["Recent New", "Recent Mid"])
+		self.assertEqual(len(get_recent_hires(add_days(today(), -30), company=self.company, limit=1)), 1)
+		for days in (0, -7, "abc"):
+			self.assertRaises(frappe.ValidationError, get_recently_hired_employees, days=days)
+
+	def test_transfer_moves_employees_and_counters(self):
+		target = make_department("Transfer Target", self.other_company).name
+		first = make_employee("Transfer One", self.department, self.company)
+		second = make_employee("Transfer Two", self.department, self.company)
+		make_employee("Transfer Stays", self.department, self.company)
+
+		result = transfer_employees(target, employees=[first.name, second.name], commit=False)
+
+		self.assertEqual(result["moved"], 2)
+		self.assertEqual(frappe.db.get_value("Employee", first.name, "company"), self.other_company)
+		self.assertEqual(get_count("Department", self.department), 1)
+		self.assertEqual(get_count("Department", target), 2)
+		self.assertEqual(get_count("Company", self.company), 1)
+		self.assertEqual(get_count("Company", self.other_company), 2)
+
+	def test_transfer_endpoint_checks_user_permissions(self):
+		mine = make_employee("Transfer Mine", self.department, self.company)
+		hidden_department = make_department("Transfer Hidden", self.other_company).name
+		theirs = make_employee("Transfer Theirs", hidden_department, self.other_company)
+
+		frappe.set_user(make_restricted_user(self.company))
+		try:
+			with self.assertRaises(frappe.PermissionError):
+				transfer_employees_endpoint(department=hidden_department, employees=[mine.name])
+			with self.assertRaises(frappe.PermissionError):
+				transfer_employees_endpoint(department=self.other_department, employees=[theirs.name])
+			result = transfer_employees_endpoint(
+				department=self.other_department, employees=[mine.name, theirs.name]
+			)
+		finally:
+			frappe.set_user("Administrator")
+
+		self.assertEqual(result["moved"], 1)
+		self.assertEqual([row["name"] for row in result["failed"]], [theirs.name])
+		self.assertEqual(frappe.db.get_value("Employee", theirs.name, "department"), hidden_department)
+
+	def test_export_walks_chunks_and_streams_gzip(self):
+		names = sorted(
+			make_employee(f"Export {index}", self.department, self.company).name for index in range(5)
+		)
+		fields, filters = ["name", "employee_name"], [["Employee", "company", "=", self.company]]
+
+		chunks = list(iter_chunks("Employee", fields, filters, chunk_size=2))
+		self.assertEqual([len(rows) for rows in chunks], [2, 2, 1])
+		self.assertEqual([row.name for rows in chunks for row in rows], names)
+		self.assertLess(chunks[0][-1].name, chunks[1][0].name)
+		self.assertLess(chunks[1][-1].name, chunks[2][0].name)
+
+		body = b"".join(iter_export("Employee", fields, filters, compress=True, chunk_size=2))
+		rows = list(csv.reader(io.StringIO(gzip.decompress(body).decode())))
+		self.assertEqual(rows[0], fields)
+		self.assertEqual(len(rows) - 1, len(names))
+		self.assertEqual((rows[1][0], rows[-1][0]), (names[0], names[-1]))
+
+		body = b"".join(iter_export("Employee", fields, filters, fmt="jsonl", chunk_size=2))
+		lines = [json.loads(line) for line in body.decode().splitlines()]
+		self.assertEqual([line["name"] for line in lines], names)
+
+	def test_projection_allow_list_and_include(self):
+		read_fields = ["name", "employee_name", "workflow_state as status"]
+		self.assertEqual(select_fields(None, read_fields), read_fields)
+		self.assertEqual(select_fields("status", read_fields), ["name", "workflow_state as status"])
+		self.assertEqual(select_fields('["employee_name"]', read_fields), ["name", "employee_name"])
+		# response names only, never raw columns or SQL
+		for requested in ("workflow_state", "email_address", "name, sleep(1)"):
+			self.assertRaises(frappe.ValidationError, select_fields, requested, read_fields)
+
+		relations = ["departments", "employees"]
+		self.assertEqual(parse_include(None, relations, default=relations), set(relations))
+		self.assertEqual(parse_include("", relations, default=relations), set())
+		self.assertEqual(parse_include("employees", relations), {"employees"})
+		self.assertRaises(frappe.ValidationError, parse_include, "managers", relations)
+
+		self.assertEqual(get_related_limit({}), 10)
+		self.assertIsNone(get_related_limit({}, "employees", default=None))
+		self.assertEqual(get_related_limit({"related_limit": 3, "employees_limit": 5}, "employees"), 5)
+		self.assertEqual(get_related_limit({"related_limit": 1000}), 100)
+
+
+class TestEmployeeTransitions(FrappeTestCase):
+	def setUp(self):
+		make_employee_workflow()
+		self.company = make_company("_Test Transition Co").name
+		self.department = make_department("Hiring", self.company).name
+
+	def tearDown(self):
+		frappe.db.rollback()
+		# the workflow lookup is cached per doctype
+		frappe.clear_cache(doctype="Employee")
+		frappe.cache.hdel("workflow", "Employee")
+
+	def make_applicant(self, employee_name, designation="Engineer", hired_on=None):
+		employee = make_employee(employee_name, self.department, self.company)
+		frappe.db.set_value(
+			"Employee",
+			employee.name,
+			{
+				"workflow_state": "Application Received",
+				"designation_positiontitle": designation,
+				"hired_on": hired_on,
+			},
+		)
+		return employee.name
+
+	def test_hire_updates_state_fields_and_keeps_hired_on(self):
+		new_hire = self.make_applicant("Transition New")
+		rehire = self.make_applicant("Transition Rehire", hired_on=add_days(today(), -100))
+
+		result = transition_employees([new_hire, rehire], "Hire", commit=False)
+
+		self.assertEqual((result["updated"], result["failed"]), (2, 0))
+		for name in (new_hire, rehire):
+			row = frappe.db.get_value("Employee", name, ["workflow_state", "status"], as_dict=True)
+			self.assertEqual((row.workflow_state, row.status), ("Hired", "Hired"))
+		# hired_on is stamped only where it was empty
+		self.assertEqual(str(frappe.db.get_value("Employee", new_hire, "hired_on")), today())
+		self.assertEqual(str(frappe.db.get_value("Employee", rehire, "hired_on")), add_days(today(), -100))
+
+	def test_condition_picks_the_transition_per_row(self):
+		engineer = self.make_applicant("Transition Engineer")
+		analyst = self.make_applicant("Transition Analyst", designation="Analyst")
+
+		result = transition_employees([engineer, analyst], "Hire", commit=False)
+
+		self.assertEqual([row["to"] for row in result["results"]], ["Hired", "Not Accepted"])
+		self.assertEqual(frappe.db.get_value("Employee", analyst, "workflow_state"), "Not Accepted")
+		self.assertIsNone(frappe.db.get_value("Employee", analyst, "hired_on"))
+
+	def test_failed_rows_are_reported_and_left_alone(self):
+		ready = self.make_applicant("Transition Ready")
+		# the conditions call .startswith() on this field, so they raise for this row
+		broken = self.make_applicant("Transition Broken")
+		frappe.db.set_value("Employee", broken, "designation_positiontitle", None)
+		hired = self.make_applicant("Transition Hired")
+		frappe.db.set_value("Employee", hired, "workflow_state", "Hired")
+
+		result = transition_employees([ready, broken, hired, "_missing"], "Hire", commit=False)
+
+		self.assertEqual((result["updated"], result["failed"]), (1, 3))
+		self.assertEqual([row["ok"] for row in result["results"]], [True, False, False, False])
+		self.assertIn("Condition failed", result["results"][1]["error"])
+		self.assertEqual(frappe.db.get_value("Employee", broken, "workflow_state"), "Application Received")
+
+	def test_rows_outside_user_permissions_are_refused(self):
+		mine = self.make_applicant("Transition Mine")
+		other_company = make_company("_Test Transition Other Co").name
+		theirs = make_employee(
+			"Transition Theirs", make_department("Transition Hidden", other_company).name, other_company
+		).name
+		frappe.db.set_value("Employee", theirs, "workflow_state", "Application Received")
+
+		frappe.set_user(make_restricted_user(self.company))
+		try:
+			result = transition_employees([mine, theirs], "Hire", commit=False)
+		finally:
+			frappe.set_user("Administrator")
+
+		self.assertEqual((result["updated"], result["failed"]), (1, 1))
+		self.assertEqual(result["results"][1]["error"], "Not permitted.")
+		self.assertEqual(frappe.db.get_value("Employee", theirs, "workflow_state"), "Application Received")
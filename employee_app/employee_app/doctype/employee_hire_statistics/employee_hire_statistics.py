@@ -0,0 +1,16 @@
+# Copyright (c) 2025, Mostafa K. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class EmployeeHireStatistics(Document):
+    """Hired employees per (company, department, month of hired_on), maintained by
+    employee_app.employee_app.statistics."""
+
+    pass
+
+
+def on_doctype_update():
+    frappe.db.add_unique("Employee Hire Statistics", ["company", "department", "month"])
@@ -0,0 +1,15 @@
+# Copyright (c) 2025, Mostafa K. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class EmployeeStatistics(Document):
+    """One row per (company, department), maintained by employee_app.employee_app.statistics."""
+
+    pass
+
+
+def on_doctype_update():
+    frappe.db.add_unique("Employee Statistics", ["company", "department"])
@@ -0,0 +1,54 @@
+# Copyright (c) 2025, Mostafa K. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, today
+
+from employee_app.employee_app import statistics
+from employee_app.employee_app.doctype.employee.test_employee import (
+	make_company,
+	make_department,
+	make_employee,
+)
+
+
+class TestEmployeeStatistics(FrappeTestCase):
+	def setUp(self):
+		self.company = make_company("_Test Statistics Co").name
+		self.department = make_department("Research", self.company).name
+		self.other_department = make_department("Quality", self.company).name
+
+	def tearDown(self):
+		frappe.db.rollback()
+
+	def test_hooks_maintain_statistics(self):
+		first = make_employee("Stats One", self.department, self.company)
+		make_employee("Stats Two", self.department, self.company)
+		summary = statistics.get_summary(self.company, self.department)
+		self.assertEqual(summary["total_employees"], 2)
+		self.assertEqual(summary["by_status"][first.workflow_state], 2)
+		self.assertEqual(statistics.get_summary(self.company, self.other_department)["total_employees"], 0)
+
+		first.department = self.other_department
+		first.save()
+		self.assertEqual(statistics.get_summary(self.company, self.department)["total_employees"], 1)
+		self.assertEqual(statistics.get_summary(self.company, self.other_department)["total_employees"], 1)
+
+		first.delete()
+		self.assertEqual(statistics.get_summary(self.company)["total_employees"], 1)
+
+	def test_rebuild_matches_source_rows(self):
+		hired = make_employee("Stats Hired", self.department, self.company)
+		make_employee("Stats Applicant", self.department, self.company)
+		frappe.db.set_value(
+			"Employee", hired.name, {"workflow_state": "Hired", "hired_on": add_days(today(), -10)}
+		)
+
+		statistics.rebuild_statistics()
+
+		summary = statistics.get_summary(self.company, self.department)
+		self.assertEqual(summary["total_employees"], 2)
+		self.assertEqual(summary["by_status"]["Hired"], 1)
+		self.assertEqual(summary["average_days_employed"], 10)
+		self.assertEqual(statistics.get_summary(self.company, self.other_department)["total_employees"], 0)
@@ -0,0 +1,16 @@
+# Copyright (c) 2025, Mostafa K. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class SyncTombstone(Document):
+    """A deleted Employee, Department or Company, kept for delta sync clients."""
+
+    pass
+
+
+def on_doctype_update():
+    # keyset walk of get_changes
+    frappe.db.add_index("Sync Tombstone", ["creation", "name"], "sync_tombstone_creation_index")
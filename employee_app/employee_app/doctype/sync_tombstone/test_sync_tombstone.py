@@ -0,0 +1,109 @@
+# Copyright (c) 2025, Mostafa K. and Contributors
+# See license.txt
+
+import datetime
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import now_datetime
+
+from employee_app.employee_app import sync
+from employee_app.employee_app.doctype.employee.test_employee import (
+	make_company,
+	make_department,
+	make_employee,
+	make_restricted_user,
+)
+
+
+class TestSyncTombstone(FrappeTestCase):
+	def tearDown(self):
+		frappe.set_user("Administrator")
+		frappe.db.rollback()
+
+	def test_changes_and_deletions_since_token(self):
+		start = now_datetime() - datetime.timedelta(minutes=2)
+		earlier = now_datetime() - datetime.timedelta(minutes=1)
+		company = make_company("_Test Sync Co").name
+		department = make_department("Field", company).name
+		employee = make_employee("Sync One", department, company).name
+		frappe.db.set_value("Employee", employee, "modified", earlier, update_modified=False)
+
+		positions = {doctype: [str(start), ""] for doctype in sync.SYNC_DOCTYPES}
+		positions[sync.TOMBSTONE] = [str(start), 0]
+		result = sync.get_changes(sync.encode_token(start, positions))
+		self.assertIn(employee, [row.name for row in result["changes"]["Employee"]])
+
+		frappe.delete_doc("Employee", employee)
+		frappe.db.sql(
+			f"UPDATE `tab{sync.TOMBSTONE}` SET `creation` = %s WHERE `ref_name` = %s",
+			(earlier, employee),
+		)
+		result = sync.get_changes(result["sync_token"])
+		self.assertNotIn(employee, [row.name for row in result["changes"]["Employee"]])
+		self.assertIn({"doctype": "Employee", "name": employee}, [
+			{"doctype": row["doctype"], "name": row["name"]} for row in result["deleted"]
+		])
+
+	def test_open_hold_caps_the_walk_until_rollback(self):
+		started = now_datetime() - datetime.timedelta(minutes=1)
+		sync.hold_changes()
+		frappe.cache.hset(sync.HOLDS_KEY, frappe.local.employee_app_sync_hold, started)
+		lag = datetime.timedelta(seconds=sync.SYNC_LAG_SECONDS)
+		self.assertEqual(sync.get_upper_bound(), started - lag)
+
+		frappe.db.rollback()
+		self.assertIsNone(frappe.local.employee_app_sync_hold)
+		self.assertGreater(sync.get_upper_bound(), started)
+
+	def test_days_employed_is_not_synced(self):
+		self.assertNotIn("days_employed", sync.get_sync_fields("Employee"))
+		self.assertIn("hired_on", sync.get_sync_fields("Employee"))
+
+	def test_company_rename_touches_linked_rows(self):
+		earlier = now_datetime() - datetime.timedelta(minutes=1)
+		company = make_company("_Test Sync Renamed Co")
+		department = make_department("Renamed", company.name).name
+		employee = make_employee("Sync Renamed", department, company.name).name
+		for doctype, name in (("Department", department), ("Employee", employee)):
+			frappe.db.set_value(doctype, name, "modified", earlier, update_modified=False)
+
+		sync.record_rename(company, old="_Test Sync Old Co", new=company.name)
+
+		for doctype, name in (("Department", department), ("Employee", employee)):
+			self.assertGreater(frappe.db.get_value(doctype, name, "modified"), earlier)
+		self.assertEqual(
+			frappe.db.get_value(sync.TOMBSTONE, {"ref_name": "_Test Sync Old Co"}, "company"),
+			"_Test Sync Old Co",
+		)
+
+	def test_restricted_user_syncs_only_permitted_companies(self):
+		start = now_datetime() - datetime.timedelta(minutes=2)
+		earlier = now_datetime() - datetime.timedelta(minutes=1)
+		visible = make_company("_Test Sync Visible Co").name
+		hidden = make_company("_Test Sync Hidden Co").name
+		kept, gone = {}, {}
+		for company in (visible, hidden):
+			department = make_department("Gone", company).name
+			kept[company] = make_employee(f"Sync Kept {company}", department, company).name
+			gone[company] = make_employee(f"Sync Gone {company}", department, company).name
+			frappe.delete_doc("Employee", gone[company])
+		frappe.db.sql(
+			"UPDATE `tabEmployee` SET `modified` = %s WHERE `name` IN %s", (earlier, list(kept.values()))
+		)
+		frappe.db.sql(
+			f"UPDATE `tab{sync.TOMBSTONE}` SET `creation` = %s WHERE `ref_name` IN %s",
+			(earlier, list(gone.values())),
+		)
+
+		positions = {doctype: [str(start), ""] for doctype in sync.SYNC_DOCTYPES}
+		positions[sync.TOMBSTONE] = [str(start), 0]
+		frappe.set_user(make_restricted_user(visible))
+		result = sync.get_changes(sync.encode_token(start, positions))
+		changed = [row.name for row in result["changes"]["Employee"]]
+		deleted = [row["name"] for row in result["deleted"]]
+
+		self.assertIn(kept[visible], changed)
+		self.assertNotIn(kept[hidden], changed)
+		self.assertIn(gone[visible], deleted)
+		self.assertNotIn(gone[hidden], deleted)
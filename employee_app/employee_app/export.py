@@ -0,0 +1,141 @@
+# Copyright (c) 2025, Mostafa K. and contributors
+# For license information, please see license.txt
+
+import csv
+import io
+import json
+import zlib
+from contextlib import contextmanager
+
+import frappe
+
+from employee_app.employee_app.projection import output_name
+
+EXPORT_FORMATS = ("csv", "jsonl")
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def iter_chunks(doctype, fields, filters=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield lists of at most `chunk_size` matching rows until the table is exhausted.
+
+    Chunks are walked by primary key (`name > last`), so no query holds a
+    cursor or transaction open while a slow client downloads, and only one
+    chunk is ever held in memory.
+    """
+    last_name = None
+    while True:
+        chunk_filters = list(filters or [])
+        if last_name is not None:
+            chunk_filters.append([doctype, "name", ">", last_name])
+
+        rows = frappe.get_all(
+            doctype,
+            fields=fields,
+            filters=chunk_filters,
+            order_by="name asc",
+            limit=chunk_size,
+        )
+        if rows:
+            yield rows
+        if len(rows) < chunk_size:
+            return
+        last_name = rows[-1].name
+
+
+def encode_chunk(fmt, columns, rows):
+    if fmt == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows([row.get(column) for column in columns] for row in rows)
+        return buffer.getvalue()
+
+    return "".join(
+        json.dumps({column: row.get(column) for column in columns}, default=str) + "\n"
+        for row in rows
+    )
+
+
+@contextmanager
+def _stream_context(site, user):
+    """Database access for a response body that is iterated after the handler returned.
+
+    By then the request may have released frappe.local or closed the
+    connection, so both are restored here and cleaned up afterwards.
+    """
+    if not getattr(frappe.local, "site", None):
+        frappe.init(site=site)
+        frappe.connect()
+        frappe.set_user(user)
+        try:
+            yield
+        finally:
+            frappe.destroy()
+        return
+
+    opened = not frappe.db._conn
+    if opened:
+        frappe.db.connect()
+    try:
+        yield
+    finally:
+        # a connection the request still holds is the request's to close
+        if opened:
+            frappe.db.close()
+
+
+def iter_export(
+    doctype,
+    fields,
+    filters=None,
+    fmt="csv",
+    compress=False,
+    site=None,
+    user=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+):
+    """Yield the export as encoded byte chunks, optionally gzip-compressed."""
+    columns = [output_name(field) for field in fields]
+    compressor = zlib.compressobj(wbits=31) if compress else None
+
+    def emit(text):
+        data = text.encode("utf-8")
+        return compressor.compress(data) if compressor else data
+
+    with _stream_context(site, user):
+        if fmt == "csv":
+            yield emit(encode_chunk(fmt, columns, [{column: column for column in columns}]))
+
+        for rows in iter_chunks(doctype, fields, filters, chunk_size):
+            yield emit(encode_chunk(fmt, columns, rows))
+
+        if compressor:
+            yield compressor.flush()
+
+
+def build_response(doctype, fields, filters=None, fmt="csv", compress=False, filename="export"):
+    """Streaming werkzeug response for a CSV / JSONL export."""
+    from werkzeug.wrappers import Response
+
+    if fmt not in EXPORT_FORMATS:
+        frappe.throw(f"Unsupported export format '{fmt}'. Use one of: {', '.join(EXPORT_FORMATS)}")
+
+    filename = f"{filename}.{fmt}"
+    mimetype = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    if compress:
+        filename += ".gz"
+        mimetype = "application/gzip"
+
+    body = iter_export(
+        doctype,
+        fields,
+        filters,
+        fmt=fmt,
+        compress=compress,
+        site=frappe.local.site,
+        user=frappe.session.user,
+    )
+    return Response(
+        body,
+        mimetype=mimetype,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        direct_passthrough=True,
+    )
@@ -0,0 +1,194 @@
+# Copyright (c) 2025, Mostafa K. and contributors
+# For license information, please see license.txt
+
+import frappe
+
+from employee_app.employee_app.search import SEARCH_FIELDS
+
+# Composite indexes for the app's hot paths, per doctype: (index_name, columns)
+INDEXES = {
+    "Employee": [
+        # keyset pagination of list_employees
+        ("employee_creation_name_index", ["creation", "name"]),
+        # delta sync walk of get_changes
+        ("employee_modified_name_index", ["modified", "name"]),
+        # company counters, cascade delete, company-scoped lists
+        ("employee_company_creation_index", ["company", "creation", "name"]),
+        # department counters, cascade delete, department-scoped lists
+        ("employee_department_creation_index", ["department", "creation", "name"]),
+        # Hired-only refresh job, recent hires and hired_on range filters
+        ("employee_state_hired_on_index", ["workflow_state", "hired_on"]),
+        # company-scoped recent hires
+        ("employee_company_state_hired_on_index", ["company", "workflow_state", "hired_on"]),
+        # short-prefix fallback of search_employees
+        ("employee_name_index", ["employee_name"]),
+    ],
+    "Department": [
+        ("department_creation_name_index", ["creation", "name"]),
+        ("department_modified_name_index", ["modified", "name"]),
+        ("department_company_creation_index", ["company", "creation", "name"]),
+    ],
+    "Company": [
+        ("company_creation_name_index", ["creation", "name"]),
+        ("company_modified_name_index", ["modified", "name"]),
+    ],
+}
+
+# FULLTEXT indexes, per doctype: (index_name, columns)
+FULLTEXT_INDEXES = {
+    "Employee": [
+        ("employee_search_index", SEARCH_FIELDS),
+    ],
+}
+
+# Below this many estimated rows a full scan is the optimizer's right call,
+# so check_query_plans() only reports scans over larger tables.
+DEFAULT_MIN_SCAN_ROWS = 1000
+
+
+def ensure_indexes(doctypes=None):
+    """Create any missing index from INDEXES and FULLTEXT_INDEXES. Safe to run repeatedly."""
+    for doctype, indexes in INDEXES.items():
+        if doctypes and doctype not in doctypes:
+            continue
+        for index_name, columns in indexes:
+            frappe.db.add_index(doctype, columns, index_name)
+
+    for doctype, indexes in FULLTEXT_INDEXES.items():
+        if doctypes and doctype not in doctypes:
+            continue
+        for index_name, columns in indexes:
+            table = f"tab{doctype}"
+            if not frappe.db.has_index(table, index_name):
+                frappe.db.sql_ddl(
+                    f"ALTER TABLE `{table}` ADD FULLTEXT INDEX `{index_name}` "
+                    f"({', '.join(f'`{column}`' for column in columns)})"
+                )
+
+
+def get_api_queries():
+    """SQL of the read queries issued by the API, keyed by a short label.
+
+    Sample filter values are taken from existing rows so the optimizer
+    plans them the way it would for a real request.
+    """
+    from employee_app.employee_app.api.employee import get_employee_read_fields
+    from employee_app.employee_app.batch import build_related_query
+    from employee_app.employee_app.export import DEFAULT_CHUNK_SIZE
+    from employee_app.employee_app.search import build_search_query
+    from employee_app.employee_app.sync import DEFAULT_SYNC_PAGE_SIZE, get_sync_fields
+
+    company = frappe.db.get_value("Company", {}, "name") or "_sample"
+    department = frappe.db.get_value("Department", {}, "name") or "_sample"
+    employee = frappe.db.get_value("Employee", {}, "name") or "_sample"
+    employee_fields = get_employee_read_fields()
+    page = {"order_by": "creation desc, name desc", "limit": 21, "run": 0}
+
+    def bound(query, params):
+        return frappe.db.mogrify(query, params)
+
+    def sync_walk(doctype):
+        # a page after a (modified, name) position, as sync._walk queries it
+        return frappe.get_all(
+            doctype,
+            fields=get_sync_fields(doctype),
+            filters=[[doctype, "modified", "<=", "2100-01-01"], [doctype, "modified", ">=", "2000-01-01"]],
+            or_filters=[[doctype, "modified", ">", "2000-01-01"], [doctype, "name", ">", "_sample"]],
+            order_by="modified asc, name asc",
+            limit=DEFAULT_SYNC_PAGE_SIZE + 1,
+            run=0,
+        )
+
+    def version(doctype, filters=None):
+        # the max(modified) / count(*) aggregate of responses.get_version
+        return frappe.get_all(
+            doctype,
+            filters=filters,
+            fields=["max(`modified`) as last_modified", "count(*) as row_count"],
+            order_by=None,
+            run=0,
+        )
+
+    return {
+        "list_employees": frappe.get_all("Employee", fields=employee_fields, **page),
+        "list_employees?company": frappe.get_all(
+            "Employee", fields=employee_fields, filters={"company": company}, **page
+        ),
+        "list_employees?department": frappe.get_all(
+            "Employee", fields=employee_fields, filters={"department": department}, **page
+        ),
+        "list_employees?status&hired_on": frappe.get_all(
+            "Employee",
+            fields=employee_fields,
+            filters={"workflow_state": "Hired", "hired_on": [">=", "2000-01-01"]},
+            **page,
+        ),
+        "list_departments?company": frappe.get_all(
+            "Department", fields=["name"], filters={"company": company}, **page
+        ),
+        "list_companies": frappe.get_all("Company", fields=["name"], **page),
+        "get_company_related_employee": frappe.get_all(
+            "Employee", fields=employee_fields, filters={"company": company}, run=0
+        ),
+        "get_company_related_departments": frappe.get_all(
+            "Department", fields=["name"], filters={"company": company}, run=0
+        ),
+        "get_department_related_employees": frappe.get_all(
+            "Employee",
+            fields=employee_fields,
+            filters={"department": department, "company": company},
+            run=0,
+        ),
+        "get_recently_hired_employees": frappe.get_all(
+            "Employee",
+            fields=employee_fields,
+            filters={"workflow_state": "Hired", "hired_on": [">=", "2000-01-01"]},
+            order_by="hired_on desc, name desc",
+            limit=5,
+            run=0,
+        ),
+        "get_recently_hired_employees?company": frappe.get_all(
+            "Employee",
+            fields=employee_fields,
+            filters={"company": company, "workflow_state": "Hired", "hired_on": [">=", "2000-01-01"]},
+            order_by="hired_on desc, name desc",
+            limit=5,
+            run=0,
+        ),
+        "department_cascade_delete": frappe.get_all(
+            "Employee", fields=["name"], filters={"department": department}, run=0
+        ),
+        "search_employees": bound(*build_search_query("sample text", employee_fields)),
+        "search_employees?prefix": bound(*build_search_query("sa", employee_fields)),
+        "export_employees?chunk": frappe.get_all(
+            "Employee",
+            fields=employee_fields,
+            filters=[["Employee", "name", ">", employee]],
+            order_by="name asc",
+            limit=DEFAULT_CHUNK_SIZE,
+            run=0,
+        ),
+        **{f"get_changes?{doctype}": sync_walk(doctype) for doctype in ("Company", "Department", "Employee")},
+        "fetch_related?company": bound(
+            *build_related_query("Employee", employee_fields, "company", [company], limit=10)
+        ),
+        "fetch_related?department": bound(
+            *build_related_query("Employee", employee_fields, "department", [department], limit=10)
+        ),
+        "not_modified?company": version("Company", {"name": company}),
+        "not_modified?employees": version("Employee"),
+        "not_modified?employees&company": version("Employee", {"company": company}),
+        "not_modified?departments&company": version("Department", {"company": company}),
+    }
+
+
+def check_query_plans(min_rows=DEFAULT_MIN_SCAN_ROWS):
+    """EXPLAIN every API query and return the ones that scan a whole table."""
+    failures = []
+    for label, query in get_api_queries().items():
+        for step in frappe.db.sql(f"EXPLAIN {query}", as_dict=True):
+            if step.get("type") == "ALL" and (step.get("rows") or 0) >= min_rows:
+                failures.append(
+                    frappe._dict(label=label, table=step.get("table"), rows=step.get("rows"))
+                )
+    return failures
@@ -0,0 +1,108 @@
+# Copyright (c) 2025, Mostafa K. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.utils import now
+
+JOB_KEY_PREFIX = "employee_app:job"
+JOB_STATUS_TTL = 24 * 60 * 60
+JOB_TIMEOUT = 3600
+PROGRESS_EVENT = "employee_app_job_progress"
+
+# Queue per kind of work. Override with `employee_app_job_queues` in site
+# config, e.g. {"delete": "employee_app_bulk"} after adding that queue to
+# `workers` in common_site_config.json.
+DEFAULT_QUEUES = {
+    "delete": "long",
+    "reassign": "long",
+    "reconcile": "long",
+}
+
+
+def no_progress(percent, description=None, rows_processed=None):
+    """Progress callback for engines called outside run_job."""
+
+
+def get_queue(operation):
+    queues = {**DEFAULT_QUEUES, **(frappe.conf.get("employee_app_job_queues") or {})}
+    return queues.get(operation, "long")
+
+
+def _key(job_id):
+    return f"{JOB_KEY_PREFIX}:{job_id}"
+
+
+def get_job(job_id):
+    return frappe.cache.get_value(_key(job_id))
+
+
+def update_job(job_id, **values):
+    """Merge `values` into the job record and push it to the submitting user."""
+    job = get_job(job_id) or {}
+    job.update(values)
+    frappe.cache.set_value(_key(job_id), job, expires_in_sec=JOB_STATUS_TTL)
+    frappe.publish_realtime(PROGRESS_EVENT, job, user=job.get("user"))
+    return job
+
+
+def submit_job(operation, method, description=None, **kwargs):
+    """Enqueue `method(**kwargs, progress=...)` and return the tracking job id immediately."""
+    job_id = frappe.generate_hash(length=12)
+    update_job(
+        job_id,
+        job_id=job_id,
+        operation=operation,
+        description=description,
+        status="queued",
+        progress=0,
+        rows_processed=0,
+        errors=[],
+        result=None,
+        user=frappe.session.user,
+        queued_at=now(),
+    )
+    frappe.enqueue(
+        "employee_app.employee_app.jobs.run_job",
+        queue=get_queue(operation),
+        timeout=JOB_TIMEOUT,
+        enqueue_after_commit=True,
+        tracking_id=job_id,
+        engine=method,
+        kwargs=kwargs,
+    )
+    return job_id
+
+
+def run_job(tracking_id, engine, kwargs):
+    """Worker entry point: run the engine and keep the job record current."""
+    from employee_app.employee_app import sync
+
+    job_id = tracking_id
+    update_job(job_id, status="running", started_at=now())
+    # before the engine stamps anything, e.g. the Department save in transfer_department
+    sync.hold_changes()
+
+    def progress(percent, description=None, rows_processed=None):
+        values = {"progress": percent, "stage": description}
+        if rows_processed is not None:
+            values["rows_processed"] = rows_processed
+        update_job(job_id, **values)
+
+    try:
+        result = frappe.get_attr(engine)(**kwargs, progress=progress)
+    except Exception as e:
+        frappe.db.rollback()
+        frappe.log_error(title=f"Employee App job {job_id} failed")
+        update_job(job_id, status="failed", errors=[str(e)], finished_at=now())
+        raise
+
+    rows = sum(value for value in (result or {}).values() if isinstance(value, int))
+    update_job(
+        job_id,
+        status="finished",
+        progress=100,
+        rows_processed=rows,
+        result=result,
+        finished_at=now(),
+    )
+    return result
@@ -0,0 +1,81 @@
+# Copyright (c) 2025, Mostafa K. and contributors
+# For license information, please see license.txt
+
+import base64
+import json
+
+import frappe
+from frappe.utils import cint
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 500
+
+
+def get_page_size(page_size=None):
+    """Explicit page size from request kwargs, clamped to MAX_PAGE_SIZE."""
+    page_size = cint(page_size) or DEFAULT_PAGE_SIZE
+    return max(1, min(page_size, MAX_PAGE_SIZE))
+
+
+def encode_cursor(row):
+    """Opaque token pointing just past `row` in (creation, name) order."""
+    payload = json.dumps([str(row["creation"]), row["name"]])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        creation, name = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        frappe.throw("Invalid pagination cursor.")
+    return creation, name
+
+
+def paginate(doctype, fields, filters=None, cursor=None, page_size=None):
+    """Fetch one page of `doctype` ordered by (creation desc, name desc).
+
+    Instead of OFFSET, the page after `cursor` is found with
+    `creation <= c AND (creation < c OR name < n)`, which the
+    (creation, name) index resolves with a range scan, so every page costs
+    the same no matter how deep the client has paged.
+    """
+    page_size = get_page_size(page_size)
+    filters = list(filters or [])
+    or_filters = None
+
+    if cursor:
+        creation, name = decode_cursor(cursor)
+        filters.append([doctype, "creation", "<=", creation])
+        or_filters = [
+            [doctype, "creation", "<", creation],
+            [doctype, "name", "<", name],
+        ]
+
+    select_fields = list(fields)
+    added_creation = "creation" not in select_fields
+    if added_creation:
+        select_fields.append("creation")
+
+    rows = frappe.get_all(
+        doctype,
+        fields=select_fields,
+        filters=filters,
+        or_filters=or_filters,
+        order_by="creation desc, name desc",
+        limit=page_size + 1,
+    )
+
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    next_cursor = encode_cursor(rows[-1]) if has_more else None
+
+    if added_creation:
+        for row in rows:
+            row.pop("creation", None)
+
+    return {
+        "items": rows,
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+        "page_size": page_size,
+    }
@@ -0,0 +1,194 @@
+# Copyright (c) 2025, Mostafa K. and contributors
+# For license information, please see license.txt
+
+"""Opt-in per-endpoint query profiler.
+
+Enable with `"employee_app_profiler": 1` in site config. While enabled, every
+endpoint / hook wrapped with @profiled records its query count, DB time, rows
+returned, commits and wall time into Redis and emits a structured log line.
+"""
+
+import functools
+import time
+from contextlib import contextmanager
+
+import frappe
+from frappe.utils import cint, flt
+
+KEY_PREFIX = "employee_app:profile"
+# Upper bounds (ms) of the wall-time histogram buckets; the last one is open.
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+PERCENTILES = (50, 90, 95, 99)
+METRICS = ("queries", "db_time_ms", "rows", "commits", "wall_ms")
+
+
+def is_enabled():
+    return bool(cint(frappe.conf.get("employee_app_profiler")))
+
+
+def _stack():
+    if not hasattr(frappe.local, "employee_app_profile_stack"):
+        frappe.local.employee_app_profile_stack = []
+    return frappe.local.employee_app_profile_stack
+
+
+def _patch_db(db):
+    """Route db.sql / db.commit of this connection through counting wrappers."""
+    sql, commit = db.sql, db.commit
+
+    def counting_sql(*args, **kwargs):
+        started = time.perf_counter()
+        result = sql(*args, **kwargs)
+        elapsed = (time.perf_counter() - started) * 1000
+        rows = len(result) if isinstance(result, list | tuple) else 0
+        for frame in _stack():
+            frame["queries"] += 1
+            frame["db_time_ms"] += elapsed
+            frame["rows"] += rows
+        return result
+
+    def counting_commit(*args, **kwargs):
+        for frame in _stack():
+            frame["commits"] += 1
+        return commit(*args, **kwargs)
+
+    db.sql = counting_sql
+    db.commit = counting_commit
+
+
+def _unpatch_db(db):
+    for attr in ("sql", "commit"):
+        db.__dict__.pop(attr, None)
+
+
+@contextmanager
+def profile(label, force=False, persist=True):
+    """Measure everything the enclosed block does against the database.
+
+    Yields the frame being filled in (None when profiling is off). `force`
+    profiles even if the site has not enabled it; `persist=False` skips
+    the Redis stats and log line, for callers that read the frame directly.
+    """
+    if not (force or is_enabled()) or not frappe.db:
+        yield None
+        return
+
+    stack = _stack()
+    db = frappe.local.db
+    if not stack:
+        _patch_db(db)
+
+    frame = {"label": label, **dict.fromkeys(METRICS, 0)}
+    stack.append(frame)
+    started = time.perf_counter()
+    try:
+        yield frame
+    finally:
+        frame["wall_ms"] = (time.perf_counter() - started) * 1000
+        stack.pop()
+        if not stack:
+            _unpatch_db(db)
+        if persist:
+            record(frame)
+
+
+def profiled(fn=None, label=None):
+    """Decorator form of profile(); labels default to module.function."""
+    if fn is None:
+        return functools.partial(profiled, label=label)
+
+    name = label or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__qualname__}"
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with profile(name):
+            # frappe.call keeps the request-arg filtering frappe applies to `fn` itself
+            return frappe.call(fn, *args, **kwargs)
+
+    return wrapper
+
+
+def _key(label):
+    return frappe.cache.make_key(f"{KEY_PREFIX}:{label}")
+
+
+def _labels_key():
+    return frappe.cache.make_key(f"{KEY_PREFIX}:labels")
+
+
+def _bucket(wall_ms):
+    for bound in BUCKETS_MS:
+        if wall_ms <= bound:
+            return str(bound)
+    return "inf"
+
+
+def record(frame):
+    """Add one call to the label's Redis hash and write a structured log line."""
+    frame = {**frame, "db_time_ms": round(frame["db_time_ms"], 3), "wall_ms": round(frame["wall_ms"], 3)}
+    try:
+        pipe = frappe.cache.pipeline()
+        key = _key(frame["label"])
+        pipe.sadd(_labels_key(), frame["label"])
+        pipe.hincrby(key, "calls", 1)
+        for metric in METRICS:
+            pipe.hincrbyfloat(key, metric, frame[metric])
+        pipe.hincrby(key, f"bucket:{_bucket(frame['wall_ms'])}", 1)
+        pipe.execute()
+    except Exception:
+        # profiling must never break the request it measures
+        pass
+
+    frappe.logger("employee_app.profiler").info({"event": "endpoint_profile", **frame})
+
+
+def _percentile(buckets, calls, percentile):
+    target = calls * percentile / 100
+    seen = 0
+    for bound in (*BUCKETS_MS, "inf"):
+        seen += buckets.get(str(bound), 0)
+        if seen >= target:
+            return bound
+    return "inf"
+
+
+def _raw(*commands):
+    """Run raw redis commands (no key prefixing / pickling) and return their results."""
+    pipe = frappe.cache.pipeline()
+    for command, *args in commands:
+        getattr(pipe, command)(*args)
+    return pipe.execute()
+
+
+def get_stats():
+    """Per-label totals, averages and wall-time percentiles (bucket upper bounds, ms)."""
+    labels = sorted(frappe.safe_decode(label) for label in _raw(("smembers", _labels_key()))[0])
+    hashes = _raw(*(("hgetall", _key(label)) for label in labels)) if labels else []
+
+    stats = {}
+    for label, raw in zip(labels, hashes, strict=True):
+        data = {frappe.safe_decode(k): frappe.safe_decode(v) for k, v in raw.items()}
+        calls = cint(data.get("calls"))
+        if not calls:
+            continue
+
+        buckets = {
+            field.split(":", 1)[1]: cint(value)
+            for field, value in data.items()
+            if field.startswith("bucket:")
+        }
+        totals = {metric: flt(data.get(metric)) for metric in METRICS}
+        stats[label] = {
+            "calls": calls,
+            "totals": totals,
+            "per_call": {metric: round(total / calls, 3) for metric, total in totals.items()},
+            "wall_ms_percentiles": {f"p{p}": _percentile(buckets, calls, p) for p in PERCENTILES},
+            "wall_ms_histogram": buckets,
+        }
+    return stats
+
+
+def reset_stats():
+    labels = _raw(("smembers", _labels_key()))[0]
+    keys = [_key(frappe.safe_decode(label)) for label in labels]
+    _raw(("delete", _labels_key(), *keys))
@@ -0,0 +1,68 @@
+# Copyright (c) 2025, Mostafa K. and contributors
+# For license information, please see license.txt
+
+import json
+
+import frappe
+from frappe.utils import cint
+
+DEFAULT_RELATED_LIMIT = 10
+MAX_RELATED_LIMIT = 100
+
+
+def parse_list(value):
+    """A list from a JSON array string, a comma-separated string or a list."""
+    if isinstance(value, str):
+        value = json.loads(value) if value.lstrip().startswith("[") else value.split(",")
+    return [str(item).strip() for item in value or [] if str(item).strip()]
+
+
+def output_name(field):
+    """Output name of a select-list entry ("workflow_state as status" -> "status")."""
+    return field.rsplit(" as ", 1)[-1].strip()
+
+
+def select_fields(requested, read_fields, always=("name",)):
+    """Subset of `read_fields` named by the client's `fields=` param.
+
+    Names are the ones clients see in responses (aliases, not columns) and
+    must be in the allow-list; `always` fields are added regardless. With no
+    `fields=` param the full read list is returned.
+    """
+    if not requested:
+        return list(read_fields)
+
+    by_name = {output_name(field): field for field in read_fields}
+    names = parse_list(requested)
+    unknown = [name for name in names if name not in by_name]
+    if unknown:
+        frappe.throw(
+            f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(by_name)}"
+        )
+
+    wanted = set(names) | set(always)
+    return [field for name, field in by_name.items() if name in wanted]
+
+
+def parse_include(include, allowed, default=()):
+    """Related collections requested via `include=`; `default` applies when the param is absent."""
+    if include is None:
+        return set(default)
+
+    requested = set(parse_list(include))
+    unknown = requested - set(allowed)
+    if unknown:
+        frappe.throw(f"Cannot include: {', '.join(sorted(unknown))}. Allowed: {', '.join(allowed)}")
+    return requested
+
+
+def get_related_limit(kwargs, relation=None, default=DEFAULT_RELATED_LIMIT):
+    """Per-relation cap from `<relation>_limit`, falling back to `related_limit`, then `default`.
+
+    `default=None` means no cap unless the client asks for one.
+    """
+    limit = cint(kwargs.get(f"{relation}_limit")) if relation else 0
+    limit = limit or cint(kwargs.get("related_limit")) or default
+    if limit is None:
+        return None
+    return max(1, min(limit, MAX_RELATED_LIMIT))
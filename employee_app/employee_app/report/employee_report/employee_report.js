@@ -3,6 +3,27 @@
 
 frappe.query_reports["Employee Report"] = {
 	"filters": [
-
+		{
+			"fieldname": "company",
+			"label": __("Company"),
+			"fieldtype": "Link",
+			"options": "Company",
+		},
+		{
+			"fieldname": "department",
+			"label": __("Department"),
+			"fieldtype": "Link",
+			"options": "Department",
+			"get_query": () => {
+				const company = frappe.query_report.get_filter_value("company");
+				return company ? { filters: { company } } : {};
+			},
+		},
+		{
+			"fieldname": "status",
+			"label": __("Status"),
+			"fieldtype": "Select",
+			"options": "\nApplication Received\nInterview Scheduled\nNot Accepted\nWithdrawn\nHired\nFired",
+		},
 	]
 };
@@ -1,9 +1,98 @@
 # Copyright (c) 2025, Mostafa K. and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
+from frappe.utils import add_months, get_first_day, today
+
+from employee_app.employee_app import statistics
+from employee_app.employee_app.cache import get_cached
+
+# (label, fieldname, lower bound in days, upper bound in days or None)
+TENURE_BUCKETS = [
+	("Under 1 Year", "tenure_under_1y", 0, 365),
+	("1-3 Years", "tenure_1_3y", 365, 3 * 365),
+	("3-5 Years", "tenure_3_5y", 3 * 365, 5 * 365),
+	("5+ Years", "tenure_5y_plus", 5 * 365, None),
+]
+HIRES_CHART_MONTHS = 12
 
 
 def execute(filters=None):
-	columns, data = [], []
-	return columns, data
+	filters = frappe._dict(filters or {})
+	columns = get_columns()
+	data, chart = get_cached("employee_report", lambda: get_report_data(filters), params=filters)
+	return columns, data, None, chart
+
+
+def get_columns():
+	columns = [
+		{"label": "Company", "fieldname": "company", "fieldtype": "Link", "options": "Company", "width": 180},
+		{"label": "Department", "fieldname": "department", "fieldtype": "Link", "options": "Department", "width": 200},
+		{"label": "Status", "fieldname": "status", "fieldtype": "Data", "width": 150},
+		{"label": "Employees", "fieldname": "employees", "fieldtype": "Int", "width": 110},
+	]
+	columns += [
+		{"label": label, "fieldname": fieldname, "fieldtype": "Int", "width": 110}
+		for label, fieldname, _lower, _upper in TENURE_BUCKETS
+	]
+	return columns
+
+
+def get_conditions(filters):
+	conditions = []
+	if filters.get("company"):
+		conditions.append("`company` = %(company)s")
+	if filters.get("department"):
+		conditions.append("`department` = %(department)s")
+	if filters.get("status"):
+		conditions.append("`workflow_state` = %(status)s")
+	return " AND ".join(conditions) or "1=1"
+
+
+def get_report_data(filters):
+	"""Headcount per company / department / state and hires per month, all grouped in SQL."""
+	return get_headcount(filters), get_hires_chart(filters)
+
+
+def get_headcount(filters):
+	tenure = "DATEDIFF(CURDATE(), `hired_on`)"
+	buckets = ",\n".join(
+		f"SUM(`hired_on` IS NOT NULL AND {tenure} >= {lower}"
+		+ (f" AND {tenure} < {upper}" if upper else "")
+		+ f") AS `{fieldname}`"
+		for _label, fieldname, lower, upper in TENURE_BUCKETS
+	)
+	return frappe.db.sql(
+		f"""
+		SELECT
+			`company`,
+			`department`,
+			`workflow_state` AS status,
+			COUNT(*) AS employees,
+			{buckets}
+		FROM `tabEmployee`
+		WHERE {get_conditions(filters)}
+		GROUP BY `company`, `department`, `workflow_state`
+		ORDER BY `company`, `department`, `workflow_state`
+		""",
+		filters,
+		as_dict=True,
+	)
+
+
+def get_hires_chart(filters):
+	since = add_months(get_first_day(today()), -(HIRES_CHART_MONTHS - 1))
+	hires = {}
+	if filters.get("status") in (None, "", "Hired"):
+		# precomputed per (company, department, month); no scan of tabEmployee
+		hires = statistics.get_hires_by_month(since, filters.get("company"), filters.get("department"))
+	months = [
+		add_months(since, offset).strftime("%Y-%m") for offset in range(HIRES_CHART_MONTHS)
+	]
+	return {
+		"data": {
+			"labels": months,
+			"datasets": [{"name": "Hires", "values": [hires.get(month, 0) for month in months]}],
+		},
+		"type": "bar",
+	}
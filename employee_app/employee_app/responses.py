@@ -0,0 +1,130 @@
+# Copyright (c) 2025, Mostafa K. and contributors
+# For license information, please see license.txt
+
+"""Shared response helpers for the API modules, including conditional GETs.
+
+A read endpoint calls `not_modified()` with the (doctype, filters) sets its
+payload is built from. One aggregate query per set (MAX(modified),
+COUNT(*)) yields an ETag and a Last-Modified date. When the client's
+If-None-Match / If-Modified-Since shows it already holds that version, the
+endpoint returns early with a 304 and no payload. The headers themselves are
+attached to the outgoing response by the `after_request` hook.
+
+If-Modified-Since is only honoured for a single record read by name. A set
+can shrink (a delete, a row leaving the filter) without its MAX(modified)
+moving, and Employee payloads carry days_employed, which changes with the
+calendar without touching `modified`; the ETag covers both (row count,
+today's date) but a date alone cannot.
+"""
+
+import datetime
+import hashlib
+import json
+from zoneinfo import ZoneInfo
+
+import frappe
+from frappe.utils import get_datetime, get_system_timezone, today
+from werkzeug.http import http_date, parse_date
+
+DEFAULT_CACHE_CONTROL = "private, no-cache"
+
+_HEADERS = "employee_app_response_headers"
+# Doctypes whose read payload changes with the date alone (days_employed).
+CALENDAR_DOCTYPES = ("Employee",)
+
+
+def api_response(status_code, message, data=None):
+    """Standardized API response helper."""
+    frappe.local.response["http_status_code"] = status_code
+    frappe.local.response["message"] = message
+    frappe.local.response["data"] = data
+    return frappe.local.response
+
+
+def get_version(doctype, filters=None):
+    """(max modified, row count) of the rows of `doctype` the user can read under `filters`."""
+    row = frappe.get_all(
+        doctype,
+        filters=filters,
+        fields=["max(`modified`) as last_modified", "count(*) as row_count"],
+        order_by=None,
+    )[0]
+    return row.last_modified, row.row_count
+
+
+def _to_utc(value):
+    value = get_datetime(value).replace(microsecond=0)
+    return value.replace(tzinfo=ZoneInfo(get_system_timezone())).astimezone(datetime.timezone.utc)
+
+
+def _is_single_record(doctype, filters):
+    return (
+        doctype not in CALENDAR_DOCTYPES
+        and isinstance(filters, dict)
+        and list(filters) == ["name"]
+        and isinstance(filters["name"], str)
+    )
+
+
+def _is_get_request():
+    request = getattr(frappe.local, "request", None)
+    return bool(request) and request.method in ("GET", "HEAD")
+
+
+def not_modified(*sources, params=None, cache_control=DEFAULT_CACHE_CONTROL):
+    """Validate the client's cached copy of a read response.
+
+    `sources` are (doctype, filters) pairs. `params` are the request
+    arguments that shape the payload (fields, cursor, ...), folded into the
+    ETag so different representations never share one; payloads with
+    Employee rows also fold in today's date. Sets ETag,
+    Last-Modified and Cache-Control, and returns True after setting a 304
+    status when the client's copy is current.
+
+    Only the first call in a GET request counts, so endpoints reused inside
+    another endpoint (e.g. the dashboard) do not override its validators.
+    """
+    if not _is_get_request() or getattr(frappe.local, _HEADERS, None) is not None:
+        return False
+
+    versions = [(doctype, *get_version(doctype, filters)) for doctype, filters in sources]
+    params = dict(params or {})
+    if any(doctype in CALENDAR_DOCTYPES for doctype, _filters in sources):
+        params["_today"] = today()
+    payload = json.dumps([frappe.session.user, versions, params], sort_keys=True, default=str)
+    etag = f'W/"{hashlib.md5(payload.encode()).hexdigest()}"'
+    modified = [_to_utc(last_modified) for _doctype, last_modified, _count in versions if last_modified]
+    last_modified = max(modified) if modified else None
+
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified:
+        headers["Last-Modified"] = http_date(last_modified)
+    setattr(frappe.local, _HEADERS, headers)
+
+    request = frappe.local.request
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        current = {tag.strip() for tag in if_none_match.split(",")}
+        fresh = "*" in current or etag in current
+    elif all(_is_single_record(doctype, filters) for doctype, filters in sources):
+        # If-Modified-Since only counts without If-None-Match (RFC 9110 13.1.3)
+        since = parse_date(request.headers.get("If-Modified-Since"))
+        fresh = bool(since and last_modified and last_modified <= since)
+    else:
+        fresh = False
+
+    if fresh:
+        frappe.local.response["http_status_code"] = 304
+    return fresh
+
+
+def after_request(response, request):
+    """after_request hook: attach the validators set by not_modified()."""
+    headers = getattr(frappe.local, _HEADERS, None)
+    if not headers:
+        return
+
+    for header, value in headers.items():
+        response.headers[header] = value
+    if response.status_code == 304:
+        response.set_data(b"")
@@ -0,0 +1,91 @@
+# Copyright (c) 2025, Mostafa K. and contributors
+# For license information, please see license.txt
+
+"""Typeahead search over employees, backed by the FULLTEXT index in indexes.py.
+
+InnoDB keeps the FULLTEXT index current on every INSERT/UPDATE/DELETE, so
+document hooks, bulk imports and set-based deletes need no extra upkeep.
+"""
+
+import re
+
+import frappe
+from frappe.utils import cint
+
+SEARCH_FIELDS = ["employee_name", "email_address", "mobile_number", "designation_positiontitle"]
+DEFAULT_SEARCH_LIMIT = 10
+MAX_SEARCH_LIMIT = 50
+# InnoDB's default innodb_ft_min_token_size; shorter words are not indexed.
+MIN_TOKEN_LENGTH = 3
+
+# FULLTEXT splits words on anything that is not a letter, digit or underscore,
+# so the query is tokenized the same way (which also drops boolean operators).
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+_LIKE_SPECIAL = re.compile(r"([\\%_])")
+
+
+def get_search_limit(limit=None):
+    limit = cint(limit) or DEFAULT_SEARCH_LIMIT
+    return max(1, min(limit, MAX_SEARCH_LIMIT))
+
+
+def build_match_query(text):
+    """BOOLEAN MODE query requiring every word, each as a prefix ("+jo* +smi*").
+
+    Words below MIN_TOKEN_LENGTH are dropped because the index cannot match
+    them; returns None when nothing searchable is left.
+    """
+    tokens = [token for token in _TOKEN.findall(text or "") if len(token) >= MIN_TOKEN_LENGTH]
+    if not tokens:
+        return None
+    return " ".join(f"+{token}*" for token in tokens)
+
+
+def search_employees(text, fields, company=None, department=None, limit=None):
+    """Employees matching `text`, best match first.
+
+    Short input that the FULLTEXT index cannot serve (e.g. the first two
+    keystrokes) falls back to a prefix match on employee_name, which the
+    employee_name index resolves with a range scan. Results follow the same
+    user permissions and permission query conditions as frappe.get_list.
+    """
+    text = (text or "").strip()
+    if not text:
+        return []
+
+    query, params = build_search_query(text, fields, company, department, limit)
+    return frappe.db.sql(query, params, as_dict=True)
+
+
+def build_search_query(text, fields, company=None, department=None, limit=None):
+    """(SQL, params) of `search_employees` for non-empty `text`; also EXPLAINed by indexes.py."""
+    from frappe.desk.reportview import get_match_cond
+
+    conditions, params = [], {"limit": get_search_limit(limit)}
+    if company:
+        conditions.append("`company` = %(company)s")
+        params["company"] = company
+    if department:
+        conditions.append("`department` = %(department)s")
+        params["department"] = department
+
+    match_query = build_match_query(text)
+    columns = ", ".join(f"`{field}`" for field in SEARCH_FIELDS)
+    if match_query:
+        params["match"] = match_query
+        match = f"MATCH ({columns}) AGAINST (%(match)s IN BOOLEAN MODE)"
+        conditions.append(match)
+        order_by = f"{match} DESC, `employee_name`"
+    else:
+        params["prefix"] = _LIKE_SPECIAL.sub(r"\\\1", text) + "%"
+        conditions.append("`employee_name` LIKE %(prefix)s")
+        order_by = "`employee_name`"
+
+    query = f"""
+        SELECT {", ".join(fields)}
+        FROM `tabEmployee`
+        WHERE {" AND ".join(conditions)} {get_match_cond("Employee")}
+        ORDER BY {order_by}
+        LIMIT %(limit)s
+    """
+    return query, params
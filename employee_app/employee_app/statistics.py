@@ -0,0 +1,253 @@
+# Copyright (c) 2025, Mostafa K. and contributors
+# For license information, please see license.txt
+
+"""Materialized employee statistics per (company, department).
+
+`Employee Statistics` holds headcount by workflow state and the inputs for
+average tenure; `Employee Hire Statistics` holds currently Hired employees
+per month of `hired_on`. Both are kept current by applying signed deltas
+from the document hooks and set-based write paths, and can be rebuilt from
+`tabEmployee` with `rebuild_statistics()`.
+"""
+
+from collections import Counter, defaultdict
+
+import frappe
+from frappe.utils import get_first_day, getdate, now
+
+from employee_app.employee_app.cache import INVALIDATES, invalidate
+
+STATISTICS = "Employee Statistics"
+HIRE_STATISTICS = "Employee Hire Statistics"
+
+# workflow_state -> column holding its headcount
+STATE_FIELDS = {
+    "Application Received": "application_received",
+    "Interview Scheduled": "interview_scheduled",
+    "Not Accepted": "not_accepted",
+    "Withdrawn": "withdrawn",
+    "Hired": "hired",
+    "Fired": "fired",
+}
+COUNT_FIELDS = ["total_employees", *STATE_FIELDS.values(), "tenure_employees", "tenure_days"]
+
+# Tenure is stored as a sum of days since TENURE_EPOCH, so the average never
+# needs refreshing: avg(today - hired_on) = (today - epoch) - sum / count.
+TENURE_EPOCH = "2000-01-01"
+
+
+def _tenure_days(hired_on):
+    return (getdate(hired_on) - getdate(TENURE_EPOCH)).days
+
+
+class StatisticsDelta:
+    """Signed changes to the statistics tables, applied with one upsert per touched row."""
+
+    def __init__(self):
+        self.rows = defaultdict(Counter)
+        self.hires = Counter()
+
+    def add(self, company, department, workflow_state, hired_on=None, sign=1):
+        """Count (sign > 0) or uncount (sign < 0) abs(sign) employees with these attributes."""
+        row = self.rows[(company, department)]
+        row["total_employees"] += sign
+        if workflow_state in STATE_FIELDS:
+            row[STATE_FIELDS[workflow_state]] += sign
+
+        if workflow_state == "Hired" and hired_on:
+            row["tenure_employees"] += sign
+            row["tenure_days"] += sign * _tenure_days(hired_on)
+            self.hires[(company, department, get_first_day(hired_on))] += sign
+
+    def add_doc(self, doc, sign=1):
+        self.add(doc.company, doc.department, doc.workflow_state, doc.hired_on, sign)
+
+    def apply(self):
+        timestamp, user = now(), frappe.session.user
+        for (company, department), counts in self.rows.items():
+            if not any(counts.values()):
+                continue
+            _upsert(
+                STATISTICS,
+                {"company": company, "department": department},
+                {field: counts[field] for field in COUNT_FIELDS},
+                timestamp,
+                user,
+            )
+
+        for (company, department, month), hires in self.hires.items():
+            if hires:
+                _upsert(
+                    HIRE_STATISTICS,
+                    {"company": company, "department": department, "month": month},
+                    {"hires": hires},
+                    timestamp,
+                    user,
+                )
+
+        self.rows.clear()
+        self.hires.clear()
+
+
+def _upsert(doctype, key, deltas, timestamp, user):
+    """Insert the row for `key` or add `deltas` to it, via the table's unique key."""
+    columns = ["creation", "modified", "owner", "modified_by", *key, *deltas]
+    values = {"creation": timestamp, "modified": timestamp, "owner": user, "modified_by": user, **key, **deltas}
+    updates = ", ".join(f"`{field}` = `{field}` + VALUES(`{field}`)" for field in deltas)
+    frappe.db.sql(
+        f"""
+        INSERT INTO `tab{doctype}` ({", ".join(f"`{column}`" for column in columns)})
+        VALUES ({", ".join(f"%({column})s" for column in columns)})
+        ON DUPLICATE KEY UPDATE {updates}, `modified` = VALUES(`modified`)
+        """,
+        values,
+    )
+
+
+def record_employee_change(doc, previous=None, sign=1):
+    """Apply the statistics change for one Employee write.
+
+    With `previous`, moves the employee from its old bucket to its new one.
+    """
+    delta = StatisticsDelta()
+    if previous:
+        delta.add_doc(previous, -1)
+    delta.add_doc(doc, sign)
+    delta.apply()
+
+
+def ensure_department(company, department):
+    """Create the zero row for a new department so it shows up before its first hire."""
+    _upsert(
+        STATISTICS,
+        {"company": company, "department": department},
+        {"total_employees": 0},
+        now(),
+        frappe.session.user,
+    )
+
+
+def delete_where(condition, params):
+    """Drop statistics rows whose employees were deleted set-based."""
+    for doctype in (STATISTICS, HIRE_STATISTICS):
+        frappe.db.sql(f"DELETE FROM `tab{doctype}` WHERE {condition}", params)
+
+
+def rebuild_statistics(progress=None):
+    """Recompute both tables from tabEmployee with two grouped INSERT ... SELECTs."""
+    timestamp, user = now(), frappe.session.user
+    params = {"timestamp": timestamp, "user": user, "epoch": TENURE_EPOCH}
+    hired = "`workflow_state` = 'Hired' AND `hired_on` IS NOT NULL"
+    states = ",\n".join(
+        f"SUM(`workflow_state` = {frappe.db.escape(state)})" for state in STATE_FIELDS
+    )
+
+    if progress:
+        progress(10, "Rebuilding employee statistics")
+    frappe.db.sql(f"DELETE FROM `tab{STATISTICS}`")
+    frappe.db.sql(
+        f"""
+        INSERT INTO `tab{STATISTICS}` (
+            `creation`, `modified`, `owner`, `modified_by`, `company`, `department`,
+            {", ".join(f"`{field}`" for field in COUNT_FIELDS)}
+        )
+        SELECT
+            %(timestamp)s, %(timestamp)s, %(user)s, %(user)s, `company`, `department`,
+            COUNT(*),
+            {states},
+            SUM({hired}),
+            COALESCE(SUM(IF({hired}, DATEDIFF(`hired_on`, %(epoch)s), 0)), 0)
+        FROM `tabEmployee`
+        GROUP BY `company`, `department`
+        """,
+        params,
+    )
+    # departments without employees still get their zero row
+    frappe.db.sql(
+        f"""
+        INSERT IGNORE INTO `tab{STATISTICS}` (
+            `creation`, `modified`, `owner`, `modified_by`, `company`, `department`
+        )
+        SELECT %(timestamp)s, %(timestamp)s, %(user)s, %(user)s, `company`, `name`
+        FROM `tabDepartment`
+        """,
+        params,
+    )
+
+    if progress:
+        progress(60, "Rebuilding hire statistics")
+    frappe.db.sql(f"DELETE FROM `tab{HIRE_STATISTICS}`")
+    frappe.db.sql(
+        f"""
+        INSERT INTO `tab{HIRE_STATISTICS}` (
+            `creation`, `modified`, `owner`, `modified_by`, `company`, `department`, `month`, `hires`
+        )
+        SELECT
+            %(timestamp)s, %(timestamp)s, %(user)s, %(user)s, `company`, `department`,
+            DATE_FORMAT(`hired_on`, '%%Y-%%m-01') AS month, COUNT(*)
+        FROM `tabEmployee`
+        WHERE {hired}
+        GROUP BY `company`, `department`, month
+        """,
+        params,
+    )
+
+    invalidate(*INVALIDATES["Employee"])
+    return {
+        "statistics": frappe.db.count(STATISTICS),
+        "hire_statistics": frappe.db.count(HIRE_STATISTICS),
+    }
+
+
+def _conditions(company=None, department=None):
+    conditions, params = [], {}
+    if company:
+        conditions.append("`company` = %(company)s")
+        params["company"] = company
+    if department:
+        conditions.append("`department` = %(department)s")
+        params["department"] = department
+    return " AND ".join(conditions) or "1=1", params
+
+
+def get_summary(company=None, department=None):
+    """Headcount by workflow state and average tenure of Hired employees, from the stats rows."""
+    condition, params = _conditions(company, department)
+    row = frappe.db.sql(
+        f"""
+        SELECT {", ".join(f"COALESCE(SUM(`{field}`), 0) AS `{field}`" for field in COUNT_FIELDS)}
+        FROM `tab{STATISTICS}`
+        WHERE {condition}
+        """,
+        params,
+        as_dict=True,
+    )[0]
+
+    tenure_employees = int(row.tenure_employees)
+    average_days_employed = None
+    if tenure_employees:
+        since_epoch = (getdate() - getdate(TENURE_EPOCH)).days
+        average_days_employed = round(since_epoch - float(row.tenure_days) / tenure_employees, 1)
+
+    return {
+        "total_employees": int(row.total_employees),
+        "by_status": {state: int(row[field]) for state, field in STATE_FIELDS.items()},
+        "average_days_employed": average_days_employed,
+    }
+
+
+def get_hires_by_month(since, company=None, department=None):
+    """{"YYYY-MM": hires} for months starting on or after `since`."""
+    condition, params = _conditions(company, department)
+    rows = frappe.db.sql(
+        f"""
+        SELECT DATE_FORMAT(`month`, '%%Y-%%m') AS month, SUM(`hires`) AS hires
+        FROM `tab{HIRE_STATISTICS}`
+        WHERE {condition} AND `month` >= %(since)s
+        GROUP BY `month`
+        ORDER BY `month`
+        """,
+        {**params, "since": since},
+        as_dict=True,
+    )
+    return {row.month: int(row.hires) for row in rows if row.hires}
@@ -0,0 +1,273 @@
+# Copyright (c) 2025, Mostafa K. and contributors
+# For license information, please see license.txt
+
+"""Delta sync for offline / mobile clients.
+
+A sync token records, per stream, the (modified, name) of the last row the
+client received (creation for tombstones). Every call walks each stream
+forward from there on its (modified, name) index, so the cost follows the
+number of changes, not the table size. Deletions come from `Sync Tombstone`
+rows written by the on_trash hooks and by the set-based delete paths.
+
+A row's `modified` is stamped when it is written, not when its transaction
+commits, so a long transaction can commit rows older than a token already
+handed out. Every call therefore stops short of the oldest open write: the
+set-based writers (jobs, bulk import batches, transfers, set-based deletes,
+bulk transitions, renames) call `hold_changes()` before stamping anything,
+which records the start time in Redis until the transaction commits or rolls
+back, and `get_changes` only hands out rows up to the oldest open hold,
+minus `SYNC_LAG_SECONDS` for ordinary single-document saves.
+
+`days_employed` is not synced: it changes every day without touching
+`modified`. Clients derive it from `hired_on` and `workflow_state`.
+"""
+
+import base64
+import datetime
+import json
+
+import frappe
+from frappe.utils import add_days, cint, get_datetime, now, now_datetime
+
+from employee_app.employee_app import jobs
+
+SYNC_DOCTYPES = ("Company", "Department", "Employee")
+TOMBSTONE = "Sync Tombstone"
+DEFAULT_SYNC_PAGE_SIZE = 200
+MAX_SYNC_PAGE_SIZE = 1000
+# Ordinary document saves commit within a few seconds of stamping `modified`;
+# longer writers register a hold instead (see `hold_changes`).
+SYNC_LAG_SECONDS = 2
+HOLDS_KEY = "employee_app:sync:holds"
+DEFAULT_TOMBSTONE_RETENTION_DAYS = 90
+
+
+class SyncTokenExpired(frappe.ValidationError):
+    http_status_code = 410
+
+
+def get_tombstone_retention_days():
+    return cint(frappe.conf.get("employee_app_tombstone_retention_days")) or DEFAULT_TOMBSTONE_RETENTION_DAYS
+
+
+def get_sync_fields(doctype):
+    from employee_app.employee_app.api.company import COMPANY_READ_FIELDS
+    from employee_app.employee_app.api.department import DEPARTMENT_READ_FIELDS
+    from employee_app.employee_app.api.employee import EMPLOYEE_READ_FIELDS
+
+    fields = {
+        "Company": COMPANY_READ_FIELDS,
+        "Department": DEPARTMENT_READ_FIELDS,
+        # days_employed is derived client-side from hired_on and workflow_state
+        "Employee": [field for field in EMPLOYEE_READ_FIELDS if field != "days_employed"],
+    }[doctype]
+    return [*fields, "modified"]
+
+
+# --- Holds ---
+def hold_changes():
+    """Keep `get_changes` below this transaction's writes until it commits or rolls back.
+
+    Call before the first `modified` / `creation` stamp of a long write.
+    Idempotent within a transaction.
+    """
+    if getattr(frappe.local, "employee_app_sync_hold", None):
+        return
+
+    token = frappe.generate_hash(length=10)
+    frappe.cache.hset(HOLDS_KEY, token, now_datetime())
+    frappe.local.employee_app_sync_hold = token
+
+    def _release():
+        frappe.cache.hdel(HOLDS_KEY, token)
+        frappe.local.employee_app_sync_hold = None
+
+    frappe.db.after_commit.add(_release)
+    frappe.db.after_rollback.add(_release)
+
+
+def get_upper_bound():
+    """Newest stamp that is safe to hand out: before every open hold, minus the lag."""
+    current = now_datetime()
+    # a hold older than the job timeout belongs to a killed worker
+    stale = current - datetime.timedelta(seconds=jobs.JOB_TIMEOUT)
+    starts = [current]
+    for token, started in (frappe.cache.hgetall(HOLDS_KEY) or {}).items():
+        if started < stale:
+            frappe.cache.hdel(HOLDS_KEY, token)
+        else:
+            starts.append(started)
+    return min(starts) - datetime.timedelta(seconds=SYNC_LAG_SECONDS)
+
+
+# --- Tombstones ---
+def record_tombstone(doc, method=None, *args, **kwargs):
+    """doc_events on_trash handler."""
+    _insert_tombstones(doc.doctype, [(doc.name, _get_company(doc, doc.name))])
+
+
+def record_rename(doc, method=None, old=None, new=None, merge=False):
+    """doc_events after_rename handler: the old name is gone, the new one is a change.
+
+    Frappe rewrites links to the old name in place, without touching
+    `modified`, so those rows are stamped here too.
+    """
+    hold_changes()
+    timestamp = now()
+    _insert_tombstones(doc.doctype, [(old, _get_company(doc, old))])
+    frappe.db.set_value(doc.doctype, new, "modified", timestamp, update_modified=False)
+
+    link_field = {"Company": "company", "Department": "department"}.get(doc.doctype)
+    if not link_field:
+        return
+    linked = ["Department", "Employee"] if doc.doctype == "Company" else ["Employee"]
+    for doctype in linked:
+        frappe.db.sql(
+            f"UPDATE `tab{doctype}` SET `modified` = %(modified)s WHERE `{link_field}` = %(new)s",
+            {"modified": timestamp, "new": new},
+        )
+
+
+def _get_company(doc, name):
+    return name if doc.doctype == "Company" else doc.get("company")
+
+
+def _insert_tombstones(doctype, rows):
+    """Tombstone `rows` of (name, company)."""
+    timestamp, user = now(), frappe.session.user
+    for name, company in rows:
+        frappe.db.sql(
+            f"""
+            INSERT INTO `tab{TOMBSTONE}`
+                (`creation`, `modified`, `owner`, `modified_by`, `ref_doctype`, `ref_name`, `company`)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """,
+            (timestamp, timestamp, user, user, doctype, name, company),
+        )
+
+
+def record_tombstones_where(doctype, condition, params):
+    """Tombstone every `doctype` row matching `condition`, ahead of a set-based DELETE."""
+    if doctype not in SYNC_DOCTYPES:
+        return
+    company = "`name`" if doctype == "Company" else "`company`"
+    frappe.db.sql(
+        f"""
+        INSERT INTO `tab{TOMBSTONE}`
+            (`creation`, `modified`, `owner`, `modified_by`, `ref_doctype`, `ref_name`, `company`)
+        SELECT %(_now)s, %(_now)s, %(_user)s, %(_user)s, %(_ref_doctype)s, `name`, {company}
+        FROM `tab{doctype}`
+        WHERE {condition}
+        """,
+        {**params, "_now": now(), "_user": frappe.session.user, "_ref_doctype": doctype},
+    )
+
+
+def purge_tombstones():
+    """Drop tombstones older than the retention window; older tokens must resync."""
+    cutoff = add_days(now_datetime(), -get_tombstone_retention_days())
+    frappe.db.delete(TOMBSTONE, {"creation": ["<", cutoff]})
+
+
+# --- Tokens ---
+def encode_token(issued, positions):
+    payload = json.dumps({"issued": str(issued), "positions": positions}, default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_token(token):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode()))
+        return get_datetime(payload["issued"]), payload["positions"]
+    except Exception:
+        frappe.throw("Invalid sync token.")
+
+
+# --- Walk ---
+def get_permitted_companies():
+    """Companies the user is limited to by User Permissions, or None when unrestricted."""
+    permissions = frappe.permissions.get_user_permissions(frappe.session.user).get("Company")
+    if not permissions:
+        return None
+    return [permission.get("doc") for permission in permissions]
+
+
+
+def _walk(doctype, fields, order_field, position, upto, page_size, filters=None, ignore_permissions=False):
+    """Rows of `doctype` after `position` in (order_field, name) order, up to `upto`.
+
+    Goes through frappe.get_list so user permissions scope the changes the
+    same way `get_permitted_companies` scopes the tombstones.
+    """
+    filters = [*(filters or []), [doctype, order_field, "<=", upto]]
+    or_filters = None
+    if position:
+        value, name = position
+        filters.append([doctype, order_field, ">=", value])
+        or_filters = [[doctype, order_field, ">", value], [doctype, "name", ">", name]]
+
+    rows = frappe.get_list(
+        doctype,
+        fields=fields,
+        filters=filters,
+        or_filters=or_filters,
+        order_by=f"{order_field} asc, name asc",
+        limit=page_size + 1,
+        ignore_permissions=ignore_permissions,
+    )
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if rows:
+        position = [str(rows[-1][order_field]), rows[-1]["name"]]
+    return rows, has_more, position
+
+
+def get_changes(token=None, page_size=None):
+    """Rows created or modified, and records deleted, since `token`.
+
+    Without a token the walk starts at the beginning (a full sync). Keep
+    calling with the returned token while `has_more` is true; store the
+    last token for the next sync.
+    """
+    page_size = max(1, min(cint(page_size) or DEFAULT_SYNC_PAGE_SIZE, MAX_SYNC_PAGE_SIZE))
+    positions = {}
+    if token:
+        issued, positions = decode_token(token)
+        if issued < add_days(now_datetime(), -get_tombstone_retention_days()):
+            raise SyncTokenExpired("Sync token is older than the tombstone retention window. Resync from scratch.")
+
+    upto = get_upper_bound()
+    readable = [doctype for doctype in SYNC_DOCTYPES if frappe.has_permission(doctype, "read")]
+    result = {"changes": {}, "deleted": [], "has_more": False}
+
+    for doctype in readable:
+        rows, has_more, positions[doctype] = _walk(
+            doctype, get_sync_fields(doctype), "modified", positions.get(doctype), upto, page_size
+        )
+        result["changes"][doctype] = rows
+        result["has_more"] |= has_more
+
+    if readable:
+        # only for doctypes the user can read; Sync Tombstone itself is System Manager only
+        filters = [[TOMBSTONE, "ref_doctype", "in", readable]]
+        companies = get_permitted_companies()
+        if companies is not None:
+            filters.append([TOMBSTONE, "company", "in", companies])
+        tombstones, has_more, positions[TOMBSTONE] = _walk(
+            TOMBSTONE,
+            ["name", "ref_doctype", "ref_name", "creation"],
+            "creation",
+            positions.get(TOMBSTONE),
+            upto,
+            page_size,
+            filters=filters,
+            ignore_permissions=True,
+        )
+        result["deleted"] = [
+            {"doctype": row.ref_doctype, "name": row.ref_name, "deleted_at": row.creation}
+            for row in tombstones
+        ]
+        result["has_more"] |= has_more
+
+    result["sync_token"] = encode_token(upto, positions)
+    return result
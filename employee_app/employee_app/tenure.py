@@ -0,0 +1,132 @@
+# Copyright (c) 2025, Mostafa K. and contributors
+# For license information, please see license.txt
+
+import time
+
+import frappe
+from frappe.utils import cint, getdate, today
+
+from employee_app.employee_app.utils import affected_rows
+
+# `employee_app_days_employed_mode` in site config:
+#   "stored"   - days_employed is a column refreshed by the daily scheduler job
+#   "computed" - days_employed is derived from hired_on in every read query and
+#                the daily job does nothing
+DAYS_EMPLOYED_MODES = ("stored", "computed")
+
+# Tenure for Hired employees, 0 for every other state and for rows without
+# hired_on (the stored column's default). The refresh job writes the same value,
+# so both modes return the same data. The expression goes into frappe.get_all
+# fields, which rejects a leading COALESCE / IFNULL, so NULLs are folded inside
+# DATEDIFF and by the NULL-safe comparison instead.
+_DAYS_EMPLOYED_SQL = "DATEDIFF({as_of}, COALESCE(`hired_on`, {as_of})) * (`workflow_state` <=> 'Hired')"
+
+# SQL expression used in place of the stored column in "computed" mode.
+DAYS_EMPLOYED_EXPRESSION = _DAYS_EMPLOYED_SQL.format(as_of="CURDATE()")
+
+# Tables larger than this are refreshed in keyset-paginated chunks, each in its
+# own transaction, so the nightly job never holds locks on the whole table.
+DEFAULT_CHUNK_SIZE = 50000
+
+_REFRESH_EXPRESSION = _DAYS_EMPLOYED_SQL.format(as_of="%(as_of)s")
+_REFRESH_SQL = f"""
+    UPDATE `tabEmployee`
+    SET `days_employed` = {_REFRESH_EXPRESSION}
+    WHERE `hired_on` IS NOT NULL
+        AND NOT (`days_employed` <=> {_REFRESH_EXPRESSION})
+        {{range_condition}}
+"""
+
+
+def get_days_employed_mode():
+    mode = frappe.conf.get("employee_app_days_employed_mode") or "stored"
+    if mode not in DAYS_EMPLOYED_MODES:
+        frappe.throw(
+            f"Invalid employee_app_days_employed_mode '{mode}'. Use one of: {', '.join(DAYS_EMPLOYED_MODES)}"
+        )
+    return mode
+
+
+def is_days_employed_computed():
+    return get_days_employed_mode() == "computed"
+
+
+def days_employed_field():
+    """Select-list entry for days_employed matching the configured mode."""
+    if is_days_employed_computed():
+        return f"{DAYS_EMPLOYED_EXPRESSION} as days_employed"
+    return "days_employed"
+
+
+def compute_days_employed(hired_on, workflow_state):
+    """Python twin of DAYS_EMPLOYED_EXPRESSION for documents already in memory."""
+    if not hired_on or workflow_state != "Hired":
+        return 0
+    return (getdate(today()) - getdate(hired_on)).days
+
+
+def get_chunk_size():
+    return cint(frappe.conf.get("employee_app_days_employed_chunk_size")) or DEFAULT_CHUNK_SIZE
+
+
+def refresh_days_employed(as_of=None, chunk_size=None, commit=True):
+    """Recompute days_employed for every employee with a hired_on date with set-based UPDATEs.
+
+    Hired employees get their tenure, everyone else 0. Only rows whose value actually changes are written. Returns a dict with the
+    number of rows touched, chunks run and elapsed seconds. Pass commit=False
+    to leave transaction control to the caller.
+    """
+    as_of = getdate(as_of or today())
+    chunk_size = cint(chunk_size) or get_chunk_size()
+    started = time.monotonic()
+
+    if frappe.db.estimate_count("Employee") <= chunk_size:
+        frappe.db.sql(_REFRESH_SQL.format(range_condition=""), {"as_of": as_of})
+        rows, chunks = affected_rows(), 1
+        if commit:
+            frappe.db.commit()
+    else:
+        rows, chunks = _refresh_in_chunks(as_of, chunk_size, commit)
+
+    stats = {
+        "rows": rows,
+        "chunks": chunks,
+        "elapsed": round(time.monotonic() - started, 3),
+    }
+    frappe.logger("employee_app").info({"event": "refresh_days_employed", **stats})
+    return stats
+
+
+def _refresh_in_chunks(as_of, chunk_size, commit):
+    """Walk the primary key in ranges of `chunk_size` rows, committing after each."""
+    rows = chunks = 0
+    last_name = ""
+
+    while True:
+        upper = frappe.db.sql(
+            """
+            SELECT MAX(`name`) FROM (
+                SELECT `name` FROM `tabEmployee`
+                WHERE `name` > %(last_name)s
+                ORDER BY `name`
+                LIMIT %(chunk_size)s
+            ) chunk
+            """,
+            {"last_name": last_name, "chunk_size": chunk_size},
+        )[0][0]
+        if upper is None:
+            break
+
+        frappe.db.sql(
+            _REFRESH_SQL.format(
+                range_condition="AND `name` > %(last_name)s AND `name` <= %(upper)s"
+            ),
+            {"as_of": as_of, "last_name": last_name, "upper": upper},
+        )
+        rows += affected_rows()
+        chunks += 1
+        if commit:
+            frappe.db.commit()
+        last_name = upper
+
+    return rows, chunks
@@ -0,0 +1,124 @@
+# Copyright (c) 2025, Mostafa K. and contributors
+# For license information, please see license.txt
+
+"""Set-based reassignment of employees to another department / company.
+
+No Employee documents are loaded and no hooks run: counters and statistics
+are adjusted here with one delta per affected parent, in the same
+transaction as the UPDATE.
+"""
+
+import frappe
+from frappe.utils import now
+
+from employee_app.employee_app import counters, department_map, statistics, sync
+from employee_app.employee_app.cache import INVALIDATES, invalidate
+from employee_app.employee_app.jobs import no_progress
+
+
+def _move(condition, params, department, company):
+    """Point every employee matching `condition` at (department, company). Returns rows moved."""
+    moving = f"({condition}) AND NOT (`department` = %(_department)s AND `company` = %(_company)s)"
+    params = {**params, "_department": department, "_company": company}
+    sync.hold_changes()
+
+    groups = frappe.db.sql(
+        f"""
+        SELECT `company`, `department`, `workflow_state`, `hired_on`, COUNT(*) AS cnt
+        FROM `tabEmployee`
+        WHERE {moving}
+        GROUP BY `company`, `department`, `workflow_state`, `hired_on`
+        FOR UPDATE
+        """,
+        params,
+        as_dict=True,
+    )
+    if not groups:
+        return 0
+
+    department_delta, company_delta = {}, {}
+    delta = statistics.StatisticsDelta()
+    for group in groups:
+        department_delta[group.department] = department_delta.get(group.department, 0) - group.cnt
+        company_delta[group.company] = company_delta.get(group.company, 0) - group.cnt
+        delta.add(group.company, group.department, group.workflow_state, group.hired_on, -group.cnt)
+        delta.add(company, department, group.workflow_state, group.hired_on, group.cnt)
+
+    moved = sum(group.cnt for group in groups)
+    department_delta[department] = department_delta.get(department, 0) + moved
+    company_delta[company] = company_delta.get(company, 0) + moved
+
+    frappe.db.sql(
+        f"""
+        UPDATE `tabEmployee`
+        SET `department` = %(_department)s, `company` = %(_company)s,
+            `modified` = %(_modified)s, `modified_by` = %(_user)s
+        WHERE {moving}
+        """,
+        {**params, "_modified": now(), "_user": frappe.session.user},
+    )
+
+    for name, count in department_delta.items():
+        counters.apply_delta("Department", name, "number_of_employees", count)
+    for name, count in company_delta.items():
+        counters.apply_delta("Company", name, "number_of_employees", count)
+    delta.apply()
+
+    invalidate(*INVALIDATES["Employee"])
+    return moved
+
+
+def get_target_company(department, company=None):
+    """Company of the target `department`, checked against an explicitly requested `company`."""
+    target_company = department_map.get_department_company(department)
+    if not target_company:
+        frappe.throw(f"Department {department} does not exist.")
+    if company and company != target_company:
+        frappe.throw(f"Department {department} belongs to company {target_company}, not {company}.")
+    return target_company
+
+
+def transfer_employees(
+    department, employees=None, from_department=None, company=None, progress=None, commit=True
+):
+    """Move the named `employees`, or everyone in `from_department`, to `department`.
+
+    The company always follows the target department, so the
+    department/company alignment holds for every moved row.
+    """
+    progress = progress or no_progress
+    company = get_target_company(department, company)
+
+    if employees:
+        condition, params = "`name` IN %(employees)s", {"employees": list(employees)}
+    elif from_department:
+        condition, params = "`department` = %(from_department)s", {"from_department": from_department}
+    else:
+        frappe.throw("Pass either employees or from_department.")
+
+    progress(10, "Moving employees")
+    moved = _move(condition, params, department, company)
+    if commit:
+        frappe.db.commit()
+    progress(100, "Done", moved)
+    return {"department": department, "company": company, "moved": moved}
+
+
+def realign_department_employees(department, company):
+    """Move a department's employees to `company` after the department itself moved."""
+    return _move("`department` = %(department)s", {"department": department}, department, company)
+
+
+def transfer_department(department, company, progress=None, commit=True):
+    """Move a department, with all its employees, to another company."""
+    progress = progress or no_progress
+    progress(10, "Moving department")
+    doc = frappe.get_doc("Department", department)
+    doc.company = company
+    # Department.on_update moves the counters and realigns the employees
+    doc.save(ignore_permissions=True)
+    moved = frappe.db.count("Employee", {"department": department})
+    if commit:
+        frappe.db.commit()
+    progress(100, "Done", moved)
+    return {"department": department, "company": company, "employees": moved}
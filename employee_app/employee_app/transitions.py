@@ -0,0 +1,162 @@
+# Copyright (c) 2025, Mostafa K. and contributors
+# For license information, please see license.txt
+
+"""Apply one workflow action to many employees at once.
+
+Transitions are checked in Python against the Employee workflow (state,
+action, allowed role and condition) for every row, then written with one
+UPDATE per target state. As in the form, the first transition whose
+condition holds wins. Rows outside the user's permissions are reported
+like invalid transitions. Statistics get one delta per affected bucket and
+the whole batch commits once.
+"""
+
+from collections import defaultdict
+
+import frappe
+from frappe.utils import now, today
+
+from employee_app.employee_app import statistics, sync
+from employee_app.employee_app.cache import INVALIDATES, invalidate
+
+ROW_FIELDS = ["name", "workflow_state", "company", "department", "hired_on"]
+
+
+def get_transitions(action):
+    """Transitions for `action` available to the user, and the workflow's per-state field updates.
+
+    Returns ({from_state: [(next_state, condition), ...]}, {state: (update_field, update_value)}),
+    transitions in workflow order.
+    """
+    from frappe.model.workflow import get_workflow, get_workflow_name
+
+    if not get_workflow_name("Employee"):
+        frappe.throw("No active workflow for Employee.")
+
+    workflow = get_workflow("Employee")
+    roles = set(frappe.get_roles())
+    transitions = defaultdict(list)
+    for transition in workflow.transitions:
+        if transition.action == action and transition.allowed in roles:
+            transitions[transition.state].append((transition.next_state, transition.condition))
+    if not transitions:
+        frappe.throw(f"Action '{action}' is not available to you in the Employee workflow.")
+
+    # the workflow sets these (e.g. status) when a document enters the state
+    updates = {
+        state.state: (state.update_field, state.update_value)
+        for state in workflow.states
+        if state.update_field
+    }
+    return transitions, updates
+
+
+def _condition_met(condition, row):
+    if not condition:
+        return True
+    from frappe.model.workflow import get_workflow_safe_globals
+
+    return frappe.safe_eval(condition, get_workflow_safe_globals(), {"doc": row})
+
+
+def _next_state(candidates, row):
+    """Target of the first candidate transition whose condition holds for `row`, else None."""
+    for next_state, condition in candidates:
+        if _condition_met(condition, row):
+            return next_state
+    return None
+
+
+def transition_employees(names, action, commit=True):
+    """Apply workflow `action` to every employee in `names`.
+
+    Returns {"updated", "failed", "results"} with one result per name, in
+    input order. Rows that cannot make the transition are reported and
+    left untouched; the rest are written together.
+    """
+    transitions, updates = get_transitions(action)
+    # conditions may read any field of the document
+    has_conditions = any(condition for candidates in transitions.values() for _state, condition in candidates)
+    columns = "*" if has_conditions else ", ".join(f"`{field}`" for field in ROW_FIELDS)
+    rows = {
+        row.name: row
+        for row in frappe.db.sql(
+            f"""
+            SELECT {columns}
+            FROM `tabEmployee`
+            WHERE `name` IN %(names)s
+            FOR UPDATE
+            """,
+            {"names": list(names)},
+            as_dict=True,
+        )
+    }
+
+    # the raw SELECT skips user permissions; rows the user cannot see are refused
+    permitted = set(frappe.get_list("Employee", filters={"name": ["in", list(names)]}, pluck="name", limit=0))
+
+    results, by_next_state = [], defaultdict(list)
+    delta = statistics.StatisticsDelta()
+    stamp = today()
+    for name in names:
+        row = rows.get(name)
+        if not row:
+            results.append({"name": name, "ok": False, "error": "Employee not found."})
+            continue
+        if name not in permitted:
+            results.append({"name": name, "ok": False, "error": "Not permitted."})
+            continue
+
+        try:
+            next_state = _next_state(transitions.get(row.workflow_state, []), row)
+        except Exception as e:
+            results.append(
+                {"name": name, "ok": False, "from": row.workflow_state, "error": f"Condition failed: {e}"}
+            )
+            continue
+
+        if not next_state:
+            results.append(
+                {
+                    "name": name,
+                    "ok": False,
+                    "from": row.workflow_state,
+                    "error": f"Cannot apply '{action}' from state '{row.workflow_state}'.",
+                }
+            )
+            continue
+
+        hired_on = row.hired_on or (stamp if next_state == "Hired" else None)
+        delta.add(row.company, row.department, row.workflow_state, row.hired_on, -1)
+        delta.add(row.company, row.department, next_state, hired_on, 1)
+        by_next_state[next_state].append(name)
+        results.append({"name": name, "ok": True, "from": row.workflow_state, "to": next_state})
+
+    if by_next_state:
+        sync.hold_changes()
+    timestamp, user = now(), frappe.session.user
+    for next_state, state_names in by_next_state.items():
+        assignments = ["`workflow_state` = %(state)s", "`modified` = %(modified)s", "`modified_by` = %(user)s"]
+        params = {"state": next_state, "modified": timestamp, "user": user, "names": state_names}
+        update_field, update_value = updates.get(next_state, (None, None))
+        if update_field:
+            assignments.append(f"`{update_field}` = %(update_value)s")
+            params["update_value"] = update_value
+        if next_state == "Hired":
+            # same rule as Employee.auto_set_hired_on_date, in the same write
+            assignments.append("`hired_on` = COALESCE(`hired_on`, %(today)s)")
+            params["today"] = stamp
+
+        frappe.db.sql(
+            f"UPDATE `tabEmployee` SET {', '.join(assignments)} WHERE `name` IN %(names)s",
+            params,
+        )
+
+    updated = sum(len(state_names) for state_names in by_next_state.values())
+    if updated:
+        delta.apply()
+        invalidate(*INVALIDATES["Employee"])
+        if commit:
+            frappe.db.commit()
+
+    return {"updated": updated, "failed": len(names) - updated, "results": results}
@@ -0,0 +1,48 @@
+# Copyright (c) 2025, Mostafa K. and contributors
+# For license information, please see license.txt
+
+import functools
+
+import frappe
+
+
+def affected_rows():
+    """Number of rows changed by the last statement run through frappe.db.sql."""
+    cursor = getattr(frappe.db, "_cursor", None)
+    if not cursor or cursor.rowcount is None or cursor.rowcount < 0:
+        return 0
+    return cursor.rowcount
+
+
+def unit_of_work(fn):
+    """Run a write API as one transaction: a single commit on success, rollback on error.
+
+    Document hooks must not commit on their own; everything the call does
+    lands together here.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            # frappe.call keeps the request-arg filtering frappe applies to `fn` itself
+            result = frappe.call(fn, *args, **kwargs)
+        except Exception:
+            frappe.db.rollback()
+            raise
+        frappe.db.commit()
+        return result
+
+    return wrapper
+
+
+def doc_to_dict(doc, fields):
+    """Project an in-memory document onto read fields ("a as b" aliases included).
+
+    Lets write APIs answer from the document they just saved instead of
+    selecting the row again.
+    """
+    record = frappe._dict()
+    for field in fields:
+        source, _as, alias = field.partition(" as ")
+        record[(alias or source).strip()] = doc.get(source.strip())
+    return record
@@ -137,6 +137,42 @@ app_license = "mit"
 # ---------------
 # Hook on document methods and events
 
+doc_events = {
+    "Employee": {
+        "on_update": "employee_app.employee_app.cache.invalidate_for_doc",
+        "on_trash": [
+            "employee_app.employee_app.cache.invalidate_for_doc",
+            "employee_app.employee_app.sync.record_tombstone",
+        ],
+        "after_rename": [
+            "employee_app.employee_app.cache.invalidate_for_doc",
+            "employee_app.employee_app.sync.record_rename",
+        ],
+    },
+    "Department": {
+        "on_update": "employee_app.employee_app.cache.invalidate_for_doc",
+        "on_trash": [
+            "employee_app.employee_app.cache.invalidate_for_doc",
+            "employee_app.employee_app.sync.record_tombstone",
+        ],
+        "after_rename": [
+            "employee_app.employee_app.cache.invalidate_for_doc",
+            "employee_app.employee_app.sync.record_rename",
+        ],
+    },
+    "Company": {
+        "on_update": "employee_app.employee_app.cache.invalidate_for_doc",
+        "on_trash": [
+            "employee_app.employee_app.cache.invalidate_for_doc",
+            "employee_app.employee_app.sync.record_tombstone",
+        ],
+        "after_rename": [
+            "employee_app.employee_app.cache.invalidate_for_doc",
+            "employee_app.employee_app.sync.record_rename",
+        ],
+    },
+}
+
 # Scheduled Tasks
 # ---------------
 
@@ -145,7 +181,8 @@ scheduler_events = {
 # 		"employee_app.tasks.all"
 # 	],
 "daily": [
-        "employee_app.tasks.update_days_employed_for_all"
+        "employee_app.tasks.update_days_employed_for_all",
+        "employee_app.tasks.purge_sync_tombstones",
     ]
 
 # 	"hourly": [
@@ -191,6 +228,7 @@ scheduler_events = {
 # ----------------
 # before_request = ["employee_app.utils.before_request"]
 # after_request = ["employee_app.utils.after_request"]
+after_request = ["employee_app.employee_app.responses.after_request"]
 
 # Job Events
 # ----------
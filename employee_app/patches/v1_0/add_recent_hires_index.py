@@ -0,0 +1,5 @@
+from employee_app.employee_app.indexes import ensure_indexes
+
+
+def execute():
+    ensure_indexes(["Employee"])
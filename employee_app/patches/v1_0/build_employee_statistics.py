@@ -0,0 +1,5 @@
+from employee_app.employee_app.statistics import rebuild_statistics
+
+
+def execute():
+    rebuild_statistics()
@@ -1,13 +1,19 @@
-import frappe
-from frappe.utils import today, getdate
+from employee_app.employee_app.profiler import profiled
+from employee_app.employee_app.sync import purge_tombstones
+from employee_app.employee_app.tenure import is_days_employed_computed, refresh_days_employed
 
 # hook to update days employed for all employees
+@profiled(label="tasks.update_days_employed_for_all")
 def update_days_employed_for_all(*args, **kwargs):
-    """Update days employed for all employees based on their hired_on date."""
-    
-    employees = frappe.get_all("Employee", ["name", "hired_on"])
-    for emp in employees:
-        if emp.workflow_state == "Hired" and emp.hired_on:
-            days = (today() - getdate(emp.hired_on)).days
-            frappe.db.set_value("Employee", emp.name, "days_employed", days, update_modified=False)
-    frappe.db.commit()
\ No newline at end of file
+    """Update days employed for all Hired employees based on their hired_on date."""
+    if is_days_employed_computed():
+        # days_employed is derived from hired_on at read time, nothing to store
+        return
+    return refresh_days_employed()
+
+
+# hook to drop sync tombstones past the retention window
+@profiled(label="tasks.purge_sync_tombstones")
+def purge_sync_tombstones(*args, **kwargs):
+    """Delete Sync Tombstones older than employee_app_tombstone_retention_days."""
+    purge_tombstones()